@@ -0,0 +1,266 @@
+import os
+import json
+import struct
+import pygame
+from os.path import join
+from time import perf_counter
+
+from rotation_cache import surface_bytes, mask_bytes
+
+# --- Asset Manager ---
+# Every image, mask and sound is loaded (and converted) once, by name, and the
+# same object is handed to every sprite that needs it. Assets can be
+# preloaded before a game starts or loaded lazily the first time they are asked for.
+# All the images can also come from one pack file (PACK_FILE): a single atlas
+# stored as raw RGBA pixels with an index, sliced into subsurfaces. It is
+# rebuilt from the PNGs whenever one of them is newer.
+
+IMAGES = {
+    "player": join('images', 'player.png'),
+    # Ensure you have 'yellow_ship.png' in your 'images' folder
+    "yellow_ship": join('images', 'yellow_ship.png'),
+    "meteor": join('images', 'meteor.png'),
+    # Assurez-vous d'avoir 'yellow_meteor.png' dans votre dossier 'images'
+    "yellow_meteor": join('images', 'yellow_meteor.png'),
+    "laser": join('images', 'laser.png'),
+    "star": join('images', 'star.png'),
+    "powerup": join('images', 'powerup.png'),
+}
+
+# name -> (folder, number of frames), frames are named 0.png, 1.png...
+ANIMATIONS = {
+    "explosion": (join('images', 'explosion'), 21),
+}
+
+# name -> (file, volume)
+SOUNDS = {
+    "laser": (join('audio', 'laser.wav'), 0.2),
+    "explosion": (join('audio', 'explosion.wav'), 0.2),
+    "damage": (join('audio', 'damage.ogg'), 0.2),
+}
+
+# Streamed with pygame.mixer.music instead of being decoded into memory
+MUSIC_FILE = join('audio', 'game_music.wav')
+MUSIC_FORMAT = 'mp3' # the file is an MP3 despite its name, the decoder needs the hint
+
+PACK_FILE = join('images', 'assets.pack')
+PACK_MAGIC = b'LJPK'
+PACK_HEADER = struct.Struct('<4sI') # magic, index length
+ATLAS_WIDTH = 1024
+
+# Skin name in the save data -> image name
+SKIN_IMAGES = {
+    "default": "player",
+    "yellow_ship": "yellow_ship",
+    # Add more skins here as you create them
+}
+
+class AssetManager:
+    def __init__(self, images=IMAGES, animations=ANIMATIONS, sounds=SOUNDS):
+        self.image_files = dict(images)
+        self.animation_files = dict(animations)
+        self.sound_files = dict(sounds)
+
+        self.images = {}
+        self.animations = {}
+        self.sounds = {}
+        self.masks = {} # surface id -> (surface, mask)
+        self.atlas = None # every image, when they come from the pack
+        self.loads = 0 # number of files read from disk
+
+    def image(self, name):
+        image = self.images.get(name)
+        if image is None:
+            image = self._load_image(self.image_files[name])
+            self.images[name] = image
+        return image
+
+    def frames(self, name):
+        frames = self.animations.get(name)
+        if frames is None:
+            folder, count = self.animation_files[name]
+            frames = [self._load_image(join(folder, f'{i}.png')) for i in range(count)]
+            self.animations[name] = frames
+        return frames
+
+    def sound(self, name):
+        sound = self.sounds.get(name)
+        if sound is None:
+            path, volume = self.sound_files[name]
+            sound = pygame.mixer.Sound(path)
+            self.loads += 1
+            if volume is not None:
+                sound.set_volume(volume)
+            self.sounds[name] = sound
+        return sound
+
+    def load_pack(self, path=PACK_FILE):
+        # Loads every image from the pack in one read; False if the pack can't
+        # be used, the images are then loaded from the PNGs as before
+        try:
+            if self._pack_is_stale(path):
+                self._write_pack(path)
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return False
+        self.loads += 1
+        try:
+            magic, index_length = PACK_HEADER.unpack_from(data)
+            if magic != PACK_MAGIC:
+                return False
+            index = json.loads(data[PACK_HEADER.size:PACK_HEADER.size + index_length])
+            pixels = data[PACK_HEADER.size + index_length:]
+            atlas = pygame.image.frombytes(pixels, index["size"], 'RGBA')
+            atlas = atlas.convert_alpha() if pygame.display.get_surface() else atlas
+            images = {name: atlas.subsurface(rect) for name, rect in index["images"].items()}
+            animations = {name: [atlas.subsurface(rect) for rect in rects] for name, rects in index["animations"].items()}
+        except (struct.error, ValueError, KeyError, TypeError, pygame.error):
+            # Truncated or corrupt pack (JSONDecodeError is a ValueError)
+            return False
+        self.atlas = atlas
+        self.images.update(images)
+        self.animations.update(animations)
+        return True
+
+    def source_files(self):
+        files = list(self.image_files.values())
+        for folder, count in self.animation_files.values():
+            files.extend(join(folder, f'{i}.png') for i in range(count))
+        return files
+
+    def load_music(self, path=MUSIC_FILE, format=MUSIC_FORMAT):
+        pygame.mixer.music.load(path, format)
+        self.loads += 1
+
+    def mask(self, name):
+        return self.mask_of(self.image(name))
+
+    def mask_of(self, surface):
+        # Mask of any shared surface, built the first time it is needed
+        entry = self.masks.get(id(surface))
+        if entry is None:
+            entry = (surface, pygame.mask.from_surface(surface))
+            self.masks[id(surface)] = entry
+        return entry[1]
+
+    def skin(self, skin_name):
+        return self.image(SKIN_IMAGES[skin_name])
+
+    def preload(self, images=None, animations=None, sounds=None):
+        # None means everything of that kind
+        for name in self.image_files if images is None else images:
+            self.mask(name)
+        for name in self.animation_files if animations is None else animations:
+            self.frames(name)
+        for name in self.sound_files if sounds is None else sounds:
+            self.sound(name)
+
+    def memory_report(self):
+        # Approximate bytes held by each loaded asset
+        report = {}
+        for name, image in self.images.items():
+            report[f"image:{name}"] = surface_bytes(image)
+        for name, frames in self.animations.items():
+            report[f"animation:{name}"] = sum(surface_bytes(frame) for frame in frames)
+        for name, sound in self.sounds.items():
+            report[f"sound:{name}"] = sound_bytes(sound)
+        report["masks"] = sum(mask_bytes(mask) for surface, mask in self.masks.values())
+        if self.atlas is not None:
+            # Images from the pack are parts of the atlas, the rest of it is padding
+            packed = sum(report[f"image:{name}"] for name in self.images) + sum(report[f"animation:{name}"] for name in self.animations)
+            report["atlas:unused"] = max(0, surface_bytes(self.atlas) - packed)
+        report["total"] = sum(report.values())
+        return report
+
+    def _pack_is_stale(self, path):
+        if not os.path.exists(path):
+            return True
+        newest = max((os.path.getmtime(file) for file in self.source_files() if os.path.exists(file)), default=0)
+        if os.path.getmtime(path) < newest:
+            return True
+        with open(path, 'rb') as f:
+            header = f.read(PACK_HEADER.size)
+            if len(header) < PACK_HEADER.size:
+                return True
+            magic, index_length = PACK_HEADER.unpack(header)
+            if magic != PACK_MAGIC:
+                return True
+            try:
+                index = json.loads(f.read(index_length))
+            except ValueError: # JSONDecodeError, or bytes that aren't UTF-8
+                return True
+        return not isinstance(index, dict) or index.get("sources") != self.source_files()
+
+    def _write_pack(self, path):
+        # Shelf packing, tallest images first
+        entries = [(name, None, pygame.image.load(file)) for name, file in self.image_files.items()]
+        for name, (folder, count) in self.animation_files.items():
+            entries.extend((name, i, pygame.image.load(join(folder, f'{i}.png'))) for i in range(count))
+        self.loads += len(entries)
+
+        rects = {}
+        x = y = shelf_height = 0
+        for key in sorted(range(len(entries)), key=lambda i: -entries[i][2].get_height()):
+            width, height = entries[key][2].get_size()
+            if x + width > ATLAS_WIDTH:
+                x, y, shelf_height = 0, y + shelf_height + 1, 0
+            rects[key] = [x, y, width, height]
+            x += width + 1
+            shelf_height = max(shelf_height, height)
+
+        atlas = pygame.Surface((ATLAS_WIDTH, y + shelf_height), pygame.SRCALPHA)
+        index = {"size": atlas.get_size(), "sources": self.source_files(), "images": {}, "animations": {}}
+        for key, (name, frame, surface) in enumerate(entries):
+            atlas.blit(surface, rects[key][:2])
+            if frame is None:
+                index["images"][name] = rects[key]
+            else:
+                index["animations"].setdefault(name, []).append(rects[key])
+
+        index_bytes = json.dumps(index).encode('utf-8')
+        temp_path = path + '.tmp'
+        with open(temp_path, 'wb') as f:
+            f.write(PACK_HEADER.pack(PACK_MAGIC, len(index_bytes)))
+            f.write(index_bytes)
+            f.write(pygame.image.tobytes(atlas, 'RGBA'))
+        os.replace(temp_path, path)
+
+    def _load_image(self, path):
+        self.loads += 1
+        image = pygame.image.load(path)
+        # convert_alpha() needs a display mode
+        return image.convert_alpha() if pygame.display.get_surface() else image
+
+def sound_bytes(sound):
+    mixer = pygame.mixer.get_init()
+    if mixer is None:
+        return 0
+    frequency, size, channels = mixer
+    return int(sound.get_length() * frequency * channels * abs(size) // 8)
+
+class DeferredLoader:
+    # Runs a generator of loading steps a little at a time (each yield is a
+    # point where a frame can be drawn), so a screen stays responsive while
+    # the rest of the game loads behind it
+    def __init__(self, steps):
+        self.steps = steps
+        self.done = False
+
+    def run(self, budget_ms=8):
+        end = perf_counter() + budget_ms / 1000
+        while not self.done and perf_counter() < end:
+            self._next()
+
+    def finish(self):
+        while not self.done:
+            self._next()
+
+    def _next(self):
+        try:
+            next(self.steps)
+        except StopIteration:
+            self.done = True
+
+# Shared by the game, the simulation and the tools
+assets = AssetManager()
@@ -0,0 +1,159 @@
+import os
+import copy
+import json
+import time
+import argparse
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+
+from settings import *
+from sprites import PlayerInput
+from simulation import Simulation, init_headless, load_game_surfaces, chase_pilot
+from frame_timer import percentile
+
+# --- Balancing Batch ---
+# Plays thousands of headless games with a scripted pilot on every CPU core,
+# for each combination of upgrades and spawn rules (the difficulty curve, or
+# flat rules for given spawn intervals and yellow odds), and reports the score and
+# coin distributions. Every game works on its own copy of DEFAULT_PLAYER_DATA
+# and nothing here opens the save data or the score files.
+
+UPGRADES = ["slower_cooldown", "faster_movement_speed"]
+MAX_GAME_SECONDS = 120 # games still running after this are stopped
+
+def dodge_pilot(sim):
+    # Gets out of the way of meteors falling onto the ship, otherwise like chase_pilot
+    player = sim.player.rect
+    threat = None
+    for meteor in sim.meteor_rects():
+        above = 0 <= player.top - meteor.bottom < 250
+        if above and meteor.right > player.left - 20 and meteor.left < player.right + 20:
+            if threat is None or meteor.bottom > threat.bottom:
+                threat = meteor
+    if threat is None:
+        return chase_pilot(sim)
+    go_left = threat.centerx >= player.centerx
+    if player.left < 60 or player.right > WINDOW_WIDTH - 60: # no room on one side
+        go_left = player.centerx > WINDOW_WIDTH / 2
+    return PlayerInput(left=go_left, right=not go_left, fire=True, fire_pressed=True)
+
+PILOTS = {"chase": chase_pilot, "dodge": dodge_pilot}
+
+# Loaded once per worker process
+worker_surfaces = None
+
+def init_worker():
+    global worker_surfaces
+    init_headless()
+    worker_surfaces = load_game_surfaces()
+
+def run_game(job):
+    config = job["config"]
+    player_data = copy.deepcopy(DEFAULT_PLAYER_DATA)
+    for name in config["upgrades"]:
+        player_data["upgrades"][name] = True
+    sim = Simulation(worker_surfaces, player_data, job["seed"], "sprites")
+    sim.director.curve = config["curve"]
+
+    pilot = PILOTS[job["pilot"]]
+    dt = 1 / SIMULATION_RATE
+    max_steps = int(job["max_seconds"] * SIMULATION_RATE)
+    steps = 0
+    while sim.running and steps < max_steps:
+        sim.step(dt, pilot(sim))
+        steps += 1
+    return {
+        "config": job["config"],
+        "score": sim.score,
+        "coins": player_data["coins"] - DEFAULT_PLAYER_DATA["coins"],
+        "seconds": sim.time / 1000,
+        "survived": sim.running,
+    }
+
+def spawn_curves(spawn_intervals=None, yellow_odds=None):
+    # (label, curve) pairs: DIFFICULTY_CURVE, or one flat curve per combination
+    if spawn_intervals is None and yellow_odds is None:
+        return [("courbe de difficulté", DIFFICULTY_CURVE)]
+    max_meteors = DIFFICULTY_CURVE[0][3]
+    return [(f"spawn {interval} ms | jaune 1/{odds}", [(0, interval, odds, max_meteors)])
+            for interval, odds in itertools.product(spawn_intervals or [METEOR_SPAWN_INTERVAL], yellow_odds or [YELLOW_METEOR_ODDS])]
+
+def make_jobs(games, seed, curves, pilot, max_seconds):
+    # The same seeds for every configuration, so they are compared on the same games
+    jobs = []
+    upgrade_sets = [combo for count in range(len(UPGRADES) + 1) for combo in itertools.combinations(UPGRADES, count)]
+    for upgrades, (label, curve) in itertools.product(upgrade_sets, curves):
+        config = {"upgrades": list(upgrades), "rules": label, "curve": [list(point) for point in curve]}
+        for game in range(games):
+            jobs.append({"config": config, "seed": seed + game, "pilot": pilot, "max_seconds": max_seconds})
+    return jobs
+
+def distribution(values):
+    return {
+        "mean": round(sum(values) / len(values), 2) if values else 0,
+        "p10": percentile(values, 0.10),
+        "p50": percentile(values, 0.50),
+        "p90": percentile(values, 0.90),
+        "max": max(values, default=0),
+    }
+
+def summarize(results):
+    groups = {}
+    for result in results:
+        groups.setdefault(json.dumps(result["config"], sort_keys=True), []).append(result)
+
+    prices = [(item["key"], item["cost"]) for items in SHOP_ITEMS.values() for item in items if item["cost"]]
+    report = []
+    for key, runs in groups.items():
+        coins = [run["coins"] for run in runs]
+        seconds = sum(run["seconds"] for run in runs)
+        coins_per_game = sum(coins) / len(coins)
+        report.append({
+            "config": json.loads(key),
+            "games": len(runs),
+            "score": distribution([run["score"] for run in runs]),
+            "coins": distribution(coins),
+            "coins_per_minute": round(sum(coins) / seconds * 60, 2) if seconds else 0,
+            "survived": sum(run["survived"] for run in runs),
+            # Average number of games to buy each shop item
+            "games_to_buy": {name: round(cost / coins_per_game, 1) if coins_per_game else None for name, cost in prices},
+        })
+    return report
+
+def print_report(report):
+    for group in report:
+        config = group["config"]
+        upgrades = ", ".join(config["upgrades"]) or "aucune amélioration"
+        print(f"{upgrades} | {config['rules']} | {group['games']} parties")
+        for name in ["score", "coins"]:
+            values = group[name]
+            print(f"    {name:<6} mean {values['mean']:>8}  p10 {values['p10']:>5}  p50 {values['p50']:>5}  "
+                  f"p90 {values['p90']:>5}  max {values['max']:>5}")
+        to_buy = "  ".join(f"{name} {games}" for name, games in group["games_to_buy"].items())
+        print(f"    coins/min {group['coins_per_minute']}  parties pour acheter: {to_buy}")
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Play many headless games in parallel to balance the coin economy")
+    parser.add_argument('--games', type=int, default=100, help="games per configuration")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--pilot', choices=list(PILOTS), default="dodge")
+    parser.add_argument('--spawn-intervals', type=int, nargs='+', help="flat rules instead of DIFFICULTY_CURVE")
+    parser.add_argument('--yellow-odds', type=int, nargs='+', help="flat rules instead of DIFFICULTY_CURVE")
+    parser.add_argument('--max-seconds', type=float, default=MAX_GAME_SECONDS)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--output', help="write the report as JSON")
+    args = parser.parse_args()
+
+    curves = spawn_curves(args.spawn_intervals, args.yellow_odds)
+    jobs = make_jobs(args.games, args.seed, curves, args.pilot, args.max_seconds)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers, initializer=init_worker) as pool:
+        results = list(pool.map(run_game, jobs, chunksize=max(1, len(jobs) // (args.workers * 8))))
+    elapsed = time.perf_counter() - start
+
+    report = summarize(results)
+    print(f"{len(jobs)} parties en {elapsed:.1f} s sur {args.workers} processus")
+    print_report(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=4)
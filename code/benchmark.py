@@ -0,0 +1,185 @@
+import os
+# The JSON report may go to stdout: no pygame banner before it
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+import pygame
+import copy
+import json
+import argparse
+import platform
+from time import perf_counter
+
+from settings import *
+from sprites import AnimatedExplosion, PlayerInput
+from frame_timer import FrameTimer, percentile
+from simulation import Simulation, load_game_surfaces
+from renderer import LayeredRenderer
+from screens import open_window, display_score, draw_shop
+from starfield import Starfield
+from assets import assets
+from entity_arrays import NUMPY_AVAILABLE
+from particles import ParticleSystem
+
+# --- Benchmark ---
+# Runs fixed stress scenarios and reports p50/p95/p99 frame times, with the
+# update, collisions, draw and display.update phases timed separately.
+# Usage (from the project root): python code/benchmark.py --output bench.json
+
+DEFAULT_METEOR_COUNTS = [10, 100, 500, 1000, 5000]
+FRAME_DT = 1 / 60 # every scenario advances the game by a fixed 60 FPS step
+
+def meteor_field(count, surface_name="meteor"):
+    # Keeps `count` meteors on screen, spread over the whole window
+    def refill(sim):
+        while sim.meteor_count() < count:
+            pos = (sim.rng.randint(0, WINDOW_WIDTH), sim.rng.randint(-100, WINDOW_HEIGHT))
+            sim.add_meteor(surface_name, pos)
+    return refill
+
+def rapid_fire(meteor_count):
+    refill = meteor_field(meteor_count)
+    def prepare(sim):
+        refill(sim)
+        # Power-up never runs out
+        sim.rapid_fire = True
+        sim.rapid_fire_timer = sim.get_ticks()
+    return prepare
+
+def explosions(count):
+    def refill(sim):
+        while len(sim.explosion_sprites) < count:
+            pos = (sim.rng.randint(0, WINDOW_WIDTH), sim.rng.randint(0, WINDOW_HEIGHT))
+            AnimatedExplosion(sim.surfaces["explosion"], pos, (sim.all_sprites, sim.explosion_sprites))
+    return refill
+
+def particle_field(count):
+    # Explosions all over the window until `count` particles are alive
+    def refill(sim):
+        if sim.particles is None:
+            sim.particles = ParticleSystem(max(count, MAX_PARTICLES), seed=1)
+        while sim.particles.count < count:
+            sim.particles.explode((sim.rng.randint(0, WINDOW_WIDTH), sim.rng.randint(0, WINDOW_HEIGHT)))
+    return refill
+
+def game_scenarios(meteor_counts):
+    scenarios = []
+    for count in meteor_counts:
+        scenarios.append((f"meteors_{count}", meteor_field(count), PlayerInput()))
+    scenarios.append(("rapid_fire", rapid_fire(200), PlayerInput(fire=True)))
+    scenarios.append(("explosions_500", explosions(500), PlayerInput()))
+    if NUMPY_AVAILABLE:
+        scenarios.append(("particles_20000", particle_field(20000), PlayerInput()))
+    return scenarios
+
+def open_benchmark_window(render=RENDER_BACKEND, driver=RENDER_DRIVER):
+    # The game's window, renderer and images, without the rest of main.py
+    # (save data thread, reports at exit): stdout only gets the JSON report
+    pygame.init()
+    renderer, display_surface = open_window(render, driver)
+    assets.load_pack()
+    return renderer, display_surface, load_game_surfaces()
+
+def run_game_scenario(window, prepare, controls, frames, warmup, seed, dirty_rects=True, backend=ENTITY_BACKEND):
+    # Own simulation and a copy of the save data: nothing is written to disk
+    renderer, display_surface, surfaces = window
+    sim = Simulation(surfaces, copy.deepcopy(DEFAULT_PLAYER_DATA), seed, backend)
+    timer = FrameTimer()
+    sim.timer = timer
+    if isinstance(renderer, LayeredRenderer):
+        renderer = LayeredRenderer(display_surface, use_dirty_rects=dirty_rects)
+    renderer.bake_background(sim.star_sprites)
+
+    for frame in range(warmup + frames):
+        frame_start = perf_counter()
+        prepare(sim)
+        sim.step(FRAME_DT, controls)
+        sim.running = True # the ship can be hit, the benchmark goes on
+
+        timer.start("draw")
+        renderer.begin_frame()
+        renderer.draw_game(sim)
+        timer.stop()
+        timer.start("hud")
+        renderer.add_rect(display_score(display_surface, sim.score))
+        timer.stop()
+        timer.start("display")
+        renderer.end_frame()
+        timer.stop()
+
+        timer.current["frame"] = perf_counter() - frame_start
+        timer.end_frame()
+    return timer.frames[warmup:]
+
+def run_shop_scenario(window, frames, warmup):
+    renderer, display_surface, surfaces = window
+    player_data = copy.deepcopy(DEFAULT_PLAYER_DATA)
+    starfield = Starfield(MENU_STARFIELD_MODE)
+    timer = FrameTimer()
+    for frame in range(warmup + frames):
+        frame_start = perf_counter()
+        timer.start("draw")
+        draw_shop(display_surface, player_data, starfield, 1 / MENU_ANIMATION_FPS)
+        timer.stop()
+        timer.start("display")
+        renderer.present()
+        timer.stop()
+        timer.current["frame"] = perf_counter() - frame_start
+        timer.end_frame()
+    return timer.frames[warmup:]
+
+def summarize(name, frames):
+    phases = {}
+    for phase in frames[0]:
+        values = [frame.get(phase, 0) * 1000 for frame in frames]
+        phases[phase] = {
+            "p50": round(percentile(values, 0.50), 4),
+            "p95": round(percentile(values, 0.95), 4),
+            "p99": round(percentile(values, 0.99), 4),
+            "mean": round(sum(values) / len(values), 4),
+        }
+    return {"name": name, "frames": len(frames), "frame_ms": phases.pop("frame"), "phases_ms": phases}
+
+def run_benchmarks(window, meteor_counts=DEFAULT_METEOR_COUNTS, frames=300, warmup=30, seed=1, only=None, dirty_rects=True, backend=ENTITY_BACKEND):
+    results = []
+    for name, prepare, controls in game_scenarios(meteor_counts):
+        if only and name not in only:
+            continue
+        results.append(summarize(name, run_game_scenario(window, prepare, controls, frames, warmup, seed, dirty_rects, backend)))
+    if not only or "shop" in only:
+        results.append(summarize("shop", run_shop_scenario(window, frames, warmup)))
+    return {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "video_driver": pygame.display.get_driver(),
+        "seed": seed,
+        "dirty_rects": dirty_rects,
+        "renderer": window[0].name,
+        "backend": backend,
+        "scenarios": results,
+    }
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Frame time benchmarks for the game")
+    parser.add_argument('--frames', type=int, default=300, help="measured frames per scenario")
+    parser.add_argument('--warmup', type=int, default=30, help="frames run before measuring")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--meteors', type=int, nargs='+', default=DEFAULT_METEOR_COUNTS)
+    parser.add_argument('--only', nargs='+', help="scenario names to run (e.g. meteors_1000 shop)")
+    parser.add_argument('--window', action='store_true', help="draw in a real window instead of the dummy driver")
+    parser.add_argument('--full-redraw', action='store_true', help="redraw and push the whole window every frame")
+    parser.add_argument('--backend', choices=["sprites", "numpy"], default=ENTITY_BACKEND, help="meteor and laser backend")
+    parser.add_argument('--render', choices=["surface", "texture"], default=RENDER_BACKEND, help="software blits or SDL textures")
+    parser.add_argument('--render-driver', default=RENDER_DRIVER, help="SDL renderer for --render texture, e.g. software")
+    parser.add_argument('--output', help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    if not args.window:
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    window = open_benchmark_window(args.render, args.render_driver)
+    report = run_benchmarks(window, args.meteors, args.frames, args.warmup, args.seed, args.only, not args.full_redraw, args.backend)
+    text = json.dumps(report, indent=4)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
@@ -0,0 +1,87 @@
+from collections import namedtuple
+
+from settings import DIFFICULTY_CURVE, FRAME_BUDGET_MS, MAX_EXPLOSIONS
+
+# --- Spawn Director ---
+# Decides when meteors appear, from a difficulty curve over the game time
+# (the same clock as the score), and how many live meteors are allowed.
+# Gameplay spawns only depend on the game time and the game state, so a game
+# stays the same for a given seed and input (replays). Frame times are only
+# used for cosmetic load: when frames go over budget, fewer explosions are
+# shown at once (explosion sprites) or each one has fewer particles.
+
+SpawnRules = namedtuple('SpawnRules', 'spawn_interval yellow_odds max_meteors')
+
+MIN_EXPLOSIONS = 4 # explosions always allowed, even on a slow machine
+FRAME_SMOOTHING = 0.1 # weight of the newest frame in the average frame time
+MAX_SPAWN_BACKLOG = 3 # spawn intervals kept when meteors are late (cap or long steps)
+
+def rules_at(curve, seconds):
+    # Linear interpolation between the keyframes, the last one holds forever
+    if seconds <= curve[0][0]:
+        return SpawnRules(*curve[0][1:])
+    for (t0, *start), (t1, *end) in zip(curve, curve[1:]):
+        if seconds < t1:
+            f = (seconds - t0) / (t1 - t0)
+            interval, odds, cap = (a + (b - a) * f for a, b in zip(start, end))
+            return SpawnRules(interval, round(odds), round(cap))
+    return SpawnRules(*curve[-1][1:])
+
+class SpawnDirector:
+    def __init__(self, curve=DIFFICULTY_CURVE, frame_budget=FRAME_BUDGET_MS, max_explosions=MAX_EXPLOSIONS):
+        self.curve = curve
+        self.frame_budget = frame_budget
+        self.max_explosions = max_explosions
+        self.explosion_limit = max_explosions # lowered when frames are over budget
+        self.frame_ms = 0 # smoothed frame time
+        self.reset()
+
+    def reset(self):
+        self.spawn_timer = 0
+        self.rules = rules_at(self.curve, 0)
+        self.spawned = 0
+        self.capped = 0 # spawns held back by max_meteors
+        self.explosions_skipped = 0
+        self.explosions_thinned = 0 # particle explosions made smaller
+
+    def meteor_due(self, time_ms, dt_ms, live_meteors):
+        # At most one meteor per step: late spawns are spread over the next steps
+        self.rules = rules_at(self.curve, time_ms / 1000)
+        interval = self.rules.spawn_interval
+        self.spawn_timer = min(self.spawn_timer + dt_ms, interval * MAX_SPAWN_BACKLOG)
+        if self.spawn_timer < interval:
+            return False
+        if live_meteors >= self.rules.max_meteors:
+            self.capped += 1
+            return False
+        self.spawn_timer -= interval
+        self.spawned += 1
+        return True
+
+    def observe_frame(self, frame_ms):
+        # Time the frame really took (without the wait for the frame rate cap)
+        self.frame_ms += (frame_ms - self.frame_ms) * FRAME_SMOOTHING
+        if self.frame_ms > self.frame_budget:
+            self.explosion_limit = max(MIN_EXPLOSIONS, self.explosion_limit - 1)
+        elif self.frame_ms < self.frame_budget * 0.75:
+            self.explosion_limit = min(self.max_explosions, self.explosion_limit + 1)
+
+    def allow_explosion(self, live_explosions):
+        if live_explosions < self.explosion_limit:
+            return True
+        self.explosions_skipped += 1
+        return False
+
+    def particle_scale(self):
+        # Share of the particles of an explosion to emit, follows explosion_limit
+        scale = self.explosion_limit / self.max_explosions
+        if scale < 1:
+            self.explosions_thinned += 1
+        return scale
+
+    def stats(self):
+        return {
+            "spawned": self.spawned, "capped": self.capped, "explosions_skipped": self.explosions_skipped,
+            "explosions_thinned": self.explosions_thinned,
+            "explosion_limit": self.explosion_limit, "frame_ms": round(self.frame_ms, 2),
+        }
@@ -0,0 +1,185 @@
+import pygame
+try:
+    import numpy as np
+except ImportError: # optional, the sprite classes are used without it
+    np = None
+
+from settings import WINDOW_WIDTH, WINDOW_HEIGHT
+
+# --- Entity Arrays ---
+# Optional backend for meteors and lasers: instead of one Sprite per object,
+# positions, velocities, rotation, age and the power-up flag live in NumPy
+# arrays (struct of arrays). Movement, lifetime and off-screen culling are
+# done for every entity at once, and drawing is a single Surface.blits call.
+# Same speeds, lifetimes and random draws as the Meteor and Laser sprites, but
+# not step-identical: the arrays keep float positions while the sprites move
+# integer rects, so trajectories and collision frames drift apart for the
+# same seed. A replay only checks out on the backend that recorded it.
+
+NUMPY_AVAILABLE = np is not None
+
+METEOR_LIFE_TIME = 3000 # ms, same as Meteor.life_time
+LASER_SPEED = 400 # px/s, same as Laser.update
+
+class EntityArrays:
+    # Growable columns sharing one length; removing entities keeps their order
+    def __init__(self, fields, capacity=256):
+        self.columns = {name: np.zeros(capacity, dtype) for name, dtype in fields.items()}
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def __getattr__(self, name):
+        # meteors.x -> the live part of the x column
+        columns = self.__dict__.get('columns')
+        if columns is None or name not in columns:
+            raise AttributeError(name)
+        return columns[name][:self.count]
+
+    def add(self, **values):
+        if self.count == len(next(iter(self.columns.values()))):
+            for name, column in self.columns.items():
+                self.columns[name] = np.concatenate([column, np.zeros_like(column)])
+        for name, value in values.items():
+            self.columns[name][self.count] = value
+        self.count += 1
+        return self.count - 1
+
+    def keep(self, alive):
+        # alive: one bool per live entity
+        kept = int(alive.sum())
+        if kept == self.count:
+            return
+        for column in self.columns.values():
+            column[:kept] = column[:self.count][alive]
+        self.count = kept
+
+    def clear(self):
+        self.count = 0
+
+class MeteorArrays(EntityArrays):
+    def __init__(self, surfaces, rotations):
+        super().__init__({
+            "x": float, "y": float, # center
+            "vx": float, "vy": float,
+            "rotation": float, "rotation_speed": float,
+            "age": float,
+            "kind": np.int8, # index in surfaces
+            "carrier": bool, # is_powerup_carrier
+        })
+        self.surfaces = list(surfaces)
+        self.rotations = rotations
+        self.last_dt = 0 # dt of the last update, to find where meteors were before it
+
+        # Every rotated image, mask and size, per kind and angle step
+        self.images = []
+        self.masks = []
+        sizes = np.zeros((len(self.surfaces), rotations.steps, 2), dtype=int)
+        for kind, surface in enumerate(self.surfaces):
+            images = [rotations.get(surface, index * rotations.step) for index in range(rotations.steps)]
+            self.images.append(images)
+            self.masks.append([rotations.get_mask(surface, index * rotations.step) for index in range(rotations.steps)])
+            sizes[kind] = [image.get_size() for image in images]
+        self.sizes = sizes
+
+    def spawn(self, kind, pos, rng, is_powerup_carrier=False):
+        # Same random draws, in the same order, as Meteor.__init__
+        direction_x = rng.uniform(-0.5, 0.5)
+        speed = rng.randint(400, 500)
+        rotation_speed = rng.randint(50, 150)
+        return self.add(x=pos[0], y=pos[1], vx=direction_x * speed, vy=speed, rotation=0,
+                        rotation_speed=rotation_speed, age=0, kind=kind, carrier=is_powerup_carrier)
+
+    def steps(self):
+        return np.rint(self.rotation / self.rotations.step).astype(int) % self.rotations.steps
+
+    def bounds(self):
+        # left, top, width, height of each meteor, like image.get_rect(center=...)
+        sizes = self.sizes[self.kind, self.steps()]
+        width, height = sizes[:, 0], sizes[:, 1]
+        left = self.x.astype(int) - width // 2
+        top = self.y.astype(int) - height // 2
+        return left, top, width, height
+
+    def update(self, dt):
+        self.last_dt = dt
+        self.x[:] += self.vx * dt
+        self.y[:] += self.vy * dt
+        self.age[:] += dt * 1000
+        self.rotation[:] += self.rotation_speed * dt
+
+        left, top, width, height = self.bounds()
+        off_screen = (top > WINDOW_HEIGHT) | (left > WINDOW_WIDTH) | (left + width < 0)
+        self.keep(~(off_screen | (self.age >= METEOR_LIFE_TIME)))
+
+    def blit_list(self, alpha=1.0):
+        left, top, width, height = self.bounds()
+        if alpha < 1:
+            # Drawn between the previous and the current position
+            back = (1 - alpha) * self.last_dt
+            left = (self.x - self.vx * back).astype(int) - width // 2
+            top = (self.y - self.vy * back).astype(int) - height // 2
+        images = self.images
+        return [(images[kind][step], (x, y)) for kind, step, x, y in
+                zip(self.kind.tolist(), self.steps().tolist(), left.tolist(), top.tolist())]
+
+    def texture_list(self, alpha=1.0):
+        # (surface, center, angle) for the texture renderer, which turns the
+        # unrotated surface itself (clockwise angles, rotozoom turns the other way)
+        back = (1 - alpha) * self.last_dt
+        x, y = self.x - self.vx * back, self.y - self.vy * back
+        surfaces = self.surfaces
+        return [(surfaces[kind], center, -rotation) for kind, center, rotation in
+                zip(self.kind.tolist(), zip(x.tolist(), y.tolist()), self.rotation.tolist())]
+
+    def collision_frame(self):
+        # Positions and angle steps computed once for all the tests of a frame
+        return self.bounds() + (self.steps(),)
+
+    def previous_centers(self):
+        return self.x - self.vx * self.last_dt, self.y - self.vy * self.last_dt
+
+    def collide(self, rect, mask, alive, frame):
+        # Indexes of live meteors whose mask touches `mask` placed at rect.topleft,
+        # in spawn order like spritecollide
+        left, top, width, height, steps = frame
+        near = alive & (left < rect.right) & (left + width > rect.left) & (top < rect.bottom) & (top + height > rect.top)
+        hits = []
+        kinds = self.kind
+        for index in np.flatnonzero(near).tolist():
+            meteor_mask = self.masks[kinds[index]][steps[index]]
+            if mask.overlap(meteor_mask, (int(left[index]) - rect.left, int(top[index]) - rect.top)):
+                hits.append(index)
+        return hits
+
+class LaserArrays(EntityArrays):
+    def __init__(self, surface, mask):
+        super().__init__({"x": float, "y": float}) # top left
+        self.surface = surface
+        self.mask = mask
+        self.width, self.height = surface.get_size()
+        self.last_dt = 0
+
+    def spawn(self, midbottom):
+        return self.add(x=midbottom[0] - self.width // 2, y=midbottom[1] - self.height)
+
+    def update(self, dt):
+        self.last_dt = dt
+        self.y[:] -= LASER_SPEED * dt
+        self.keep(self.y + self.height >= 0)
+
+    def rects(self):
+        width, height = self.width, self.height
+        return [pygame.Rect(x, y, width, height) for x, y in zip(self.x.astype(int).tolist(), self.y.astype(int).tolist())]
+
+    def blit_list(self, alpha=1.0):
+        surface = self.surface
+        y = self.y + LASER_SPEED * (1 - alpha) * self.last_dt
+        return [(surface, (x, y)) for x, y in zip(self.x.astype(int).tolist(), y.astype(int).tolist())]
+
+    def texture_list(self, alpha=1.0):
+        surface = self.surface
+        x = self.x + self.width / 2
+        y = self.y + self.height / 2 + LASER_SPEED * (1 - alpha) * self.last_dt
+        return [(surface, center, 0) for center in zip(x.tolist(), y.tolist())]
@@ -0,0 +1,30 @@
+# --- Fixed Timestep ---
+# The simulation always advances by the same dt, whatever the frame rate.
+# Real frame time is added to an accumulator and as many fixed steps as fit
+# are run; what is left (alpha, between 0 and 1) is used to draw sprites
+# between their previous and current position.
+
+class FixedStep:
+    def __init__(self, rate, max_frame_time=0.25):
+        self.dt = 1 / rate
+        self.max_frame_time = max_frame_time # a long stall doesn't run hundreds of steps
+        self.accumulator = 0.0
+        self.alpha = 1.0
+        self.steps_run = 0
+        self.frames = 0
+
+    def advance(self, frame_time):
+        # Number of simulation steps to run for this rendered frame
+        self.accumulator += min(frame_time, self.max_frame_time)
+        steps = 0
+        while self.accumulator >= self.dt:
+            self.accumulator -= self.dt
+            steps += 1
+        self.alpha = self.accumulator / self.dt
+        self.steps_run += steps
+        self.frames += 1
+        return steps
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.alpha = 1.0
@@ -0,0 +1,52 @@
+from time import perf_counter
+
+# --- Frame Timer ---
+# Measures how long each phase of a frame takes (update, collisions, draw...).
+# The simulation always calls it; NullFrameTimer is used when nobody is
+# measuring so it costs next to nothing.
+
+class FrameTimer:
+    def __init__(self):
+        self.current = {} # phase -> seconds, for the frame being measured
+        self.frames = [] # one dict per finished frame
+        self._phase = None
+        self._start = 0
+
+    def start(self, phase):
+        self._phase = phase
+        self._start = perf_counter()
+
+    def stop(self):
+        elapsed = perf_counter() - self._start
+        self.current[self._phase] = self.current.get(self._phase, 0) + elapsed
+
+    def end_frame(self):
+        self.frames.append(self.current)
+        self.current = {}
+
+    def reset(self):
+        self.current = {}
+        self.frames = []
+
+class NullFrameTimer:
+    def start(self, phase):
+        pass
+
+    def stop(self):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def reset(self):
+        pass
+
+NULL_TIMER = NullFrameTimer()
+
+def percentile(values, fraction):
+    # Nearest-rank percentile, values don't need to be sorted
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
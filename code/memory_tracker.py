@@ -0,0 +1,278 @@
+import os
+import sys
+import copy
+import time
+import argparse
+import tracemalloc
+try:
+    import resource # peak memory of the process, not on Windows
+except ImportError:
+    resource = None
+
+from settings import *
+from assets import assets
+from text_cache import text_cache
+from sprites import meteor_rotations
+from rotation_cache import surface_bytes
+from entity_arrays import NUMPY_AVAILABLE
+from particles import ParticleSystem
+from simulation import Simulation, init_headless, load_game_surfaces, chase_pilot
+
+# --- Memory Tracker ---
+# Where the bytes go, for the low-RAM cabinets. Every MEMORY_SAMPLE_INTERVAL
+# the tracker measures each loaded asset (images, explosion frames, sounds,
+# masks), each cache (rotated meteors, rendered texts, uploaded textures) and
+# the game: sprite objects per group, killed sprites kept by the pools, NumPy
+# entity and particle arrays. It keeps the current and peak bytes of each,
+# of their total and of the whole process. Sizes are computed from pixel
+# sizes and array lengths, not read from the allocator: close, not exact.
+#
+# Groups share their images with the assets and caches, so a group's images
+# are shown in the report but only its sprite objects count in the total.
+#
+# A cache over its budget (MEMORY_BUDGETS) is trimmed at the sample, and
+# past MEMORY_BUDGET caches are trimmed in the order of MEMORY_BUDGETS until
+# the total fits. A trimmed cache keeps the lower cap from then on, so it
+# doesn't grow back and rebuild what was evicted. Peaks are measured before
+# trimming.
+#
+# snapshot() (F4 in game) writes a tracemalloc snapshot and prints the lines
+# that allocated the most since the previous one.
+
+GROUPS = ["all_sprites", "star_sprites", "meteor_sprites", "laser_sprites", "powerup_sprites", "explosion_sprites"]
+TOTAL_GROUPS = ["all_sprites", "star_sprites"] # the other groups are parts of all_sprites
+TRACE_FRAMES = 1 # call stack depth kept by tracemalloc
+SNAPSHOT_LINES = 10
+
+def format_bytes(size):
+    if size is None:
+        return "?"
+    if abs(size) < 1024 * 1024:
+        return f"{size / 1024:.1f} ko"
+    return f"{size / 1024 / 1024:.1f} Mo"
+
+def sprite_bytes(sprite):
+    # The sprite and its attributes (rect, vectors, groups...), not its image
+    attributes = vars(sprite)
+    return sys.getsizeof(sprite) + sys.getsizeof(attributes) + sum(sys.getsizeof(value) for value in attributes.values())
+
+def array_bytes(arrays):
+    return sum(column.nbytes for column in arrays.columns.values())
+
+def process_memory():
+    # (current, peak) resident bytes of the process, None where unknown
+    current = peak = None
+    try:
+        with open('/proc/self/statm') as f:
+            current = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        pass
+    if resource is not None:
+        # Kilobytes on Linux, bytes on macOS
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+    return current, peak
+
+class MemoryTracker:
+    def __init__(self, budgets=MEMORY_BUDGETS, total_budget=MEMORY_BUDGET, interval=MEMORY_SAMPLE_INTERVAL,
+                 snapshot_path=MEMORY_SNAPSHOT_FILE, trace=MEMORY_TRACEMALLOC):
+        self.budgets = budgets
+        self.total_budget = total_budget
+        self.interval = interval / 1000
+        self.snapshot_path = snapshot_path
+
+        self.sources = {} # name -> function returning {entry: bytes}
+        self.caches = {} # name -> (function returning bytes, trim(max_bytes))
+        self.sim = None
+
+        self.current = {} # entry -> bytes at the last sample
+        self.peak = {}
+        self.groups = {} # group -> (sprites, object bytes, image bytes)
+        self.total = 0
+        self.peak_total = 0
+        self.process = (None, None)
+        self.python_heap = None # (current, peak) while tracemalloc runs
+        self.trimmed = {} # cache -> [times, bytes freed]
+        self.samples = 0
+        self.last_sample = None
+        self.last_snapshot = None
+        if trace and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+
+    def add_source(self, name, measure):
+        self.sources[name] = measure
+
+    def add_cache(self, name, measure, trim):
+        self.caches[name] = (measure, trim)
+
+    def track_simulation(self, sim):
+        self.sim = sim
+
+    def update(self):
+        # Called every frame, measures once per interval
+        now = time.perf_counter()
+        if self.last_sample is None or now - self.last_sample >= self.interval:
+            self.sample()
+
+    def sample(self):
+        self.last_sample = time.perf_counter()
+        self.samples += 1
+        current = {}
+        for measure in self.sources.values():
+            current.update(measure())
+        for name, (measure, trim) in self.caches.items():
+            current[name] = measure()
+        if self.sim is not None:
+            current.update(self.simulation_bytes(self.sim))
+
+        for name, size in current.items():
+            self.peak[name] = max(self.peak.get(name, 0), size)
+        self.peak_total = max(self.peak_total, sum(current.values()))
+        self.enforce_budgets(current)
+        self.current = current
+        self.total = sum(current.values())
+        self.process = process_memory()
+        if tracemalloc.is_tracing():
+            self.python_heap = tracemalloc.get_traced_memory()
+        return current
+
+    def simulation_bytes(self, sim):
+        sizes = {"sprites": 0}
+        self.groups = {}
+        for name in GROUPS:
+            group = getattr(sim, name)
+            images = {id(sprite.image): sprite.image for sprite in group}
+            objects = sum(sprite_bytes(sprite) for sprite in group)
+            self.groups[name] = (len(group), objects, sum(surface_bytes(image) for image in images.values()))
+            if name in TOTAL_GROUPS:
+                sizes["sprites"] += objects
+        sizes["sprite_pools"] = sum(sprite_bytes(sprite) for pool in sim.pools.values() for sprite in pool.free)
+        if sim.meteors is not None:
+            # The arrays keep every rotated meteor, even the ones trimmed from the cache
+            cached = {id(entry[0]) for entry in sim.meteors.rotations.images.values()}
+            pinned = {id(image): image for images in sim.meteors.images for image in images if id(image) not in cached}
+            sizes["meteor_arrays"] = array_bytes(sim.meteors) + sum(surface_bytes(image) for image in pinned.values())
+            sizes["laser_arrays"] = array_bytes(sim.lasers)
+        if sim.particles is not None:
+            sizes["particles"] = sum(column.nbytes for column in sim.particles.columns) + surface_bytes(sim.particles.layer)
+        return sizes
+
+    def enforce_budgets(self, current):
+        order = [name for name in self.budgets if name in self.caches]
+        order += [name for name in self.caches if name not in order]
+        for name in order:
+            budget = self.budgets.get(name)
+            if budget is not None and current[name] > budget:
+                self.trim(name, budget, current)
+        if self.total_budget is not None:
+            excess = sum(current.values()) - self.total_budget
+            for name in order:
+                if excess <= 0:
+                    break
+                before = current[name]
+                self.trim(name, max(0, before - excess), current)
+                excess -= before - current[name]
+
+    def trim(self, name, max_bytes, current):
+        measure, trim = self.caches[name]
+        trim(max_bytes)
+        size = measure()
+        if size < current[name]:
+            stats = self.trimmed.setdefault(name, [0, 0])
+            stats[0] += 1
+            stats[1] += current[name] - size
+        current[name] = size
+
+    def snapshot(self, path=None):
+        # tracemalloc only sees allocations made while it runs: the first call starts it
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            print("tracemalloc démarré, F4 à nouveau pour un snapshot")
+            return None
+        path = path or self.snapshot_path
+        snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+        snapshot.dump(path)
+        if self.last_snapshot is None:
+            stats, since = snapshot.statistics('lineno'), "depuis le début du suivi"
+        else:
+            stats, since = snapshot.compare_to(self.last_snapshot, 'lineno'), "depuis le snapshot précédent"
+        self.python_heap = tracemalloc.get_traced_memory()
+        print(f"Snapshot tracemalloc écrit dans {path} (Python {format_bytes(self.python_heap[0])}, "
+              f"pic {format_bytes(self.python_heap[1])}), plus grosses allocations {since} :")
+        for stat in stats[:SNAPSHOT_LINES]:
+            print(f"  {stat}")
+        self.last_snapshot = snapshot
+        return snapshot
+
+    def overlay_line(self):
+        line = f"memory {format_bytes(self.total)} (peak {format_bytes(self.peak_total)})"
+        if self.process[0] is not None:
+            line += f"  process {format_bytes(self.process[0])}"
+        return line
+
+    def report(self):
+        if not self.samples:
+            return
+        current, peak = self.process
+        print(f"Mémoire suivie : {format_bytes(self.total)} (pic {format_bytes(self.peak_total)}), "
+              f"processus : {format_bytes(current)} (pic {format_bytes(peak)})")
+        if self.python_heap is not None:
+            print(f"  tas Python (tracemalloc) : {format_bytes(self.python_heap[0])} (pic {format_bytes(self.python_heap[1])})")
+        for name, size in sorted(self.current.items(), key=lambda item: -item[1]):
+            budget = self.budgets.get(name) if name in self.caches else None
+            limit = f", budget {format_bytes(budget)}" if budget is not None else ""
+            print(f"  {name:<24}{format_bytes(size):>10} (pic {format_bytes(self.peak[name])}{limit})")
+        for name, (sprites, objects, images) in self.groups.items():
+            print(f"  groupe {name} : {sprites} sprites, {format_bytes(objects)} d'objets, "
+                  f"{format_bytes(images)} d'images partagées")
+        for name, (times, freed) in self.trimmed.items():
+            print(f"  {name} réduit {times} fois, {format_bytes(freed)} libérés")
+
+def asset_bytes():
+    report = assets.memory_report()
+    del report["total"]
+    return report
+
+def game_memory_tracker(renderer=None, **options):
+    # Assets and caches of the game; the simulation is added with track_simulation()
+    tracker = MemoryTracker(**options)
+    tracker.add_source("assets", asset_bytes)
+    if hasattr(renderer, "texture_bytes"): # texture renderer
+        tracker.add_cache("textures", renderer.texture_bytes, renderer.trim)
+    tracker.add_cache("text_cache", text_cache.bytes_used, text_cache.trim)
+    tracker.add_cache("rotation_cache", lambda: meteor_rotations.bytes_used, meteor_rotations.trim)
+    return tracker
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Play headless games and report where the memory goes")
+    parser.add_argument('--frames', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--backend', choices=["sprites", "numpy"], default=ENTITY_BACKEND)
+    parser.add_argument('--budget', type=float, help="MEMORY_BUDGET in Mo")
+    parser.add_argument('--snapshot', action='store_true', help="tracemalloc snapshots at the start and the end")
+    args = parser.parse_args()
+
+    init_headless()
+    budget = None if args.budget is None else int(args.budget * 1024 * 1024)
+    tracker = game_memory_tracker(total_budget=budget, trace=args.snapshot)
+    if args.snapshot:
+        tracker.snapshot()
+    sim = Simulation(load_game_surfaces(), copy.deepcopy(DEFAULT_PLAYER_DATA), args.seed, args.backend)
+    if EXPLOSION_EFFECT == "particles" and NUMPY_AVAILABLE:
+        sim.particles = ParticleSystem(seed=args.seed)
+    tracker.track_simulation(sim)
+
+    # One sample per MEMORY_SAMPLE_INTERVAL of game time
+    dt = 1 / SIMULATION_RATE
+    steps_per_sample = max(1, round(MEMORY_SAMPLE_INTERVAL / 1000 * SIMULATION_RATE))
+    start = time.perf_counter()
+    for frame in range(args.frames):
+        sim.step(dt, chase_pilot(sim))
+        if not sim.running:
+            sim.reset()
+        if frame % steps_per_sample == 0:
+            tracker.sample()
+    tracker.sample()
+    print(f"{args.frames} frames in {time.perf_counter() - start:.2f} s, {tracker.samples} samples")
+    if args.snapshot:
+        tracker.snapshot()
+    tracker.report()
@@ -0,0 +1,79 @@
+import math
+import time
+import pygame
+
+from settings import MENU_ANIMATION_FPS, MENU_IDLE_TIMEOUT
+
+# --- Menu Pacer ---
+# Menus don't need 60 redraws a second of the same picture. The pacer blocks
+# on pygame.event.wait until there is input or the next animation frame is
+# due, and tells the screen when it has to redraw. It also measures the CPU
+# time used while in the menus, to check that the machine really sits idle.
+
+class MenuPacer:
+    def __init__(self, animation_fps=MENU_ANIMATION_FPS, idle_timeout=MENU_IDLE_TIMEOUT):
+        self.frame_time = 1000 / animation_fps # ms between two animation frames
+        self.idle_timeout = idle_timeout # longest wait when nothing is animated
+        self.redraw = True
+        self.dt = 0 # seconds since the last redraw, for animations
+        self.last_draw = 0
+
+        self.wall_time = 0 # seconds spent in menus
+        self.cpu_time = 0 # process CPU seconds used meanwhile
+        self.draws = 0
+        self.wakeups = 0
+        self._wall_start = None
+        self._cpu_start = None
+
+    def begin(self):
+        # A new screen: drawn right away
+        self.redraw = True
+        self.dt = 0
+        self.last_draw = pygame.time.get_ticks()
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    def end(self):
+        if self._wall_start is not None:
+            self.wall_time += time.perf_counter() - self._wall_start
+            self.cpu_time += time.process_time() - self._cpu_start
+            self._wall_start = None
+
+    def events(self, animated=False, busy=False):
+        # Input since the last call; waits for it unless a redraw is already due.
+        # animated: redraw at the animation frame rate, busy: wake up at that
+        # rate (to load something...) but only redraw on input
+        if self.redraw:
+            events = pygame.event.get()
+        else:
+            if animated:
+                timeout = max(1, math.ceil(self.last_draw + self.frame_time - pygame.time.get_ticks()))
+            elif busy:
+                timeout = int(self.frame_time)
+            else:
+                timeout = self.idle_timeout
+            event = pygame.event.wait(timeout)
+            self.wakeups += 1
+            events = [] if event.type == pygame.NOEVENT else [event]
+            events += pygame.event.get()
+
+        now = pygame.time.get_ticks()
+        if events or (animated and now - self.last_draw >= self.frame_time):
+            self.redraw = True
+        if self.redraw:
+            self.dt = (now - self.last_draw) / 1000
+            self.last_draw = now
+        return events
+
+    def drawn(self):
+        self.redraw = False
+        self.draws += 1
+
+    def cpu_percent(self):
+        return 100 * self.cpu_time / self.wall_time if self.wall_time else 0
+
+    def report(self):
+        self.end()
+        if self.wall_time:
+            print(f"Menus : {self.wall_time:.1f} s, {self.draws} images, {self.wakeups} réveils, "
+                  f"CPU {self.cpu_percent():.1f} %")
@@ -0,0 +1,675 @@
+import copy
+import time
+import random
+import socket
+import select
+import struct
+import argparse
+import threading
+from collections import deque
+
+import pygame
+
+from settings import *
+from sprites import Player, PlayerInput, read_player_input, meteor_rotations
+from simulation import Simulation, init_headless, load_game_surfaces, COOP_SKINS
+from replay import encode_input, decode_input, UPGRADES
+from fixed_step import FixedStep
+from frame_timer import percentile
+from renderer import GAME_BACKGROUND_COLOR
+from text_cache import render_text
+from assets import assets
+
+# --- LAN Co-op ---
+# Two ships on one field. The server owns the game: it runs the Simulation
+# at NET_TICK_RATE with the input of each player and sends every client a
+# snapshot of the field after each tick, over UDP.
+#
+# Snapshots are quantized (whole pixels, meteor angles as a RotationCache
+# step, explosion frame numbers) and delta-compressed: a snapshot only holds
+# what changed since the last one the client acknowledged, and a position that
+# moved by less than 128 px takes one byte. A lost packet costs nothing, the
+# next one is relative to an older snapshot the client still has.
+#
+# Clients send their input every tick (with the few before it, in case one
+# is lost) and move their own ship right away (prediction). Snapshots say
+# which input the server applied last: the client puts its ship where the
+# server has it and re-applies the inputs the server hasn't seen yet.
+#
+# Packets (little endian):
+#   JOIN      type
+#   INPUT     type, acknowledged snapshot tick (u32), count (u8), then count x (sequence u32, input u8)
+#   LEAVE     type
+#   WELCOME   type, slot (u8), tick rate (u16), upgrades (u8 bits)
+#   FULL      type, no free ship
+#   SNAPSHOT  type, tick (u32), baseline tick (u32, 0: none), last input applied (u32), score (u32),
+#             coins (u32), flags (u8), removed (u16), entities (u16), then the removed ids (u16 each)
+#             and the entities: id (u16), field bits (u8), the fields in the order of FIELDS
+
+JOIN, INPUT, LEAVE, WELCOME, FULL, SNAPSHOT = range(1, 7)
+INPUT_HEADER = struct.Struct('<BIB')
+INPUT_ENTRY = struct.Struct('<IB')
+WELCOME_PACKET = struct.Struct('<BBHB')
+SNAPSHOT_HEADER = struct.Struct('<BIIIIIBHH')
+ENTITY_HEADER = struct.Struct('<HB')
+ENTITY_ID = struct.Struct('<H')
+
+# Entity fields: (kind, x, y, extra). extra is the slot of a ship, the angle
+# step of a meteor or the frame of an explosion.
+KINDS = ["ship", "meteor", "yellow_meteor", "laser", "explosion", "powerup"]
+KIND, X_FULL, X_DELTA, Y_FULL, Y_DELTA, EXTRA = (1 << bit for bit in range(6))
+BYTE, SIGNED_BYTE, SHORT = struct.Struct('<B'), struct.Struct('<b'), struct.Struct('<h')
+FIELDS = [(KIND, BYTE, 0, False), (X_FULL, SHORT, 1, False), (X_DELTA, SIGNED_BYTE, 1, True),
+          (Y_FULL, SHORT, 2, False), (Y_DELTA, SIGNED_BYTE, 2, True), (EXTRA, BYTE, 3, False)]
+FIELD_BITS = [(KIND, 0), (X_FULL, X_DELTA), (Y_FULL, Y_DELTA), (EXTRA, 0)] # (full, delta) bits of each field
+
+FIRE_PRESSED_BIT = encode_input(PlayerInput(fire_pressed=True))
+NET_HISTORY = 64 # snapshots kept as delta baselines (about 2 s at 30 ticks/s)
+INPUT_REDUNDANCY = 4 # inputs repeated in each INPUT packet
+MAX_INPUT_BACKLOG = 3 # inputs waiting on the server before the oldest are skipped
+RESTART_DELAY = 3 # seconds between a game over and the next game
+REPORT_INTERVAL = 5 # seconds between two server reports
+UDP_OVERHEAD = 28 # IPv4 + UDP header bytes of each packet
+RECV_SIZE = 65536
+
+def encode_entities(state, baseline):
+    # Entities that changed since the baseline, as (removed ids, entity count, bytes)
+    removed = [entity_id for entity_id in baseline if entity_id not in state]
+    entries = bytearray()
+    count = 0
+    for entity_id, values in state.items():
+        old = baseline.get(entity_id)
+        if values == old:
+            continue
+        fields = {}
+        for index, (full_bit, delta_bit) in enumerate(FIELD_BITS):
+            if old is not None and old[index] == values[index]:
+                continue
+            if delta_bit and old is not None and -128 <= values[index] - old[index] < 128:
+                fields[delta_bit] = values[index] - old[index]
+            else:
+                fields[full_bit] = values[index]
+        entries += ENTITY_HEADER.pack(entity_id, sum(fields))
+        for bit, field, index, delta in FIELDS:
+            if bit in fields:
+                entries += field.pack(fields[bit])
+        count += 1
+    return removed, count, bytes(entries)
+
+def decode_entities(data, offset, baseline, removed, count):
+    state = dict(baseline)
+    for _ in range(removed):
+        state.pop(ENTITY_ID.unpack_from(data, offset)[0], None)
+        offset += ENTITY_ID.size
+    for _ in range(count):
+        entity_id, bits = ENTITY_HEADER.unpack_from(data, offset)
+        offset += ENTITY_HEADER.size
+        values = list(state.get(entity_id, (0, 0, 0, 0)))
+        for bit, field, index, delta in FIELDS:
+            if bits & bit:
+                value = field.unpack_from(data, offset)[0]
+                offset += field.size
+                values[index] = values[index] + value if delta else value
+        if values[0] >= len(KINDS):
+            raise ValueError(f"type d'entité inconnu {values[0]}")
+        state[entity_id] = tuple(values)
+    return state
+
+def traffic(bytes_count, packets, seconds):
+    # kB/s on the wire, IP and UDP headers included
+    return (bytes_count + packets * UDP_OVERHEAD) / seconds / 1000 if seconds else 0
+
+# --- Server ---
+
+class RemotePlayer:
+    def __init__(self, address, slot):
+        self.address = address
+        self.slot = slot
+        self.joined = self.last_seen = time.perf_counter()
+        self.acked = 0 # newest snapshot the client has
+        self.inputs = {} # sequence -> (input bits, tick it arrived)
+        self.last_applied = 0
+        self.controls = PlayerInput()
+
+        self.bytes_in = self.packets_in = 0
+        self.bytes_out = self.packets_out = 0
+        self.snapshots = self.full_snapshots = 0
+        self.input_delays = deque(maxlen=NET_TICK_RATE * 60) # ticks an input waited on the server
+        self.repeated = 0 # ticks without a new input: the last one was used again
+        self.skipped = 0 # inputs dropped because too many were waiting
+
+    def next_input(self, tick):
+        # The oldest input not applied yet. A client running a bit fast has the
+        # oldest ones skipped (their space presses are kept).
+        waiting = sorted(sequence for sequence in self.inputs if sequence > self.last_applied)
+        if not waiting:
+            self.repeated += 1
+            return self.controls
+        sequence = waiting[max(0, len(waiting) - MAX_INPUT_BACKLOG)]
+        bits, arrived = self.inputs[sequence]
+        for skipped in waiting[:waiting.index(sequence)]:
+            bits |= self.inputs[skipped][0] & FIRE_PRESSED_BIT
+            self.skipped += 1
+        self.input_delays.append(tick - arrived)
+        self.inputs = {key: value for key, value in self.inputs.items() if key > sequence}
+        self.last_applied = sequence
+        self.controls = decode_input(bits)
+        controls = self.controls
+        self.controls = self.controls._replace(fire_pressed=False) # a repeated input doesn't press space again
+        return controls
+
+    def stats(self, tick_rate):
+        seconds = time.perf_counter() - self.joined
+        delays = list(self.input_delays)
+        return {
+            "slot": self.slot,
+            "out_kb_s": round(traffic(self.bytes_out, self.packets_out, seconds), 2),
+            "in_kb_s": round(traffic(self.bytes_in, self.packets_in, seconds), 2),
+            "snapshot_bytes": round(self.bytes_out / self.snapshots, 1) if self.snapshots else 0,
+            "snapshots": self.snapshots,
+            "full_snapshots": self.full_snapshots,
+            "input_delay_ticks": round(sum(delays) / len(delays), 2) if delays else 0,
+            "input_delay_p95_ms": round(percentile(delays, 0.95) * 1000 / tick_rate, 1),
+            "repeated": self.repeated,
+            "skipped": self.skipped,
+        }
+
+class CoopServer:
+    def __init__(self, surfaces, address=('', NET_PORT), tick_rate=NET_TICK_RATE, seed=None, loss=0.0):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(address)
+        self.sock.setblocking(False)
+        self.address = self.sock.getsockname()
+        self.tick_rate = tick_rate
+        self.dt = 1 / tick_rate
+        self.loss = loss # fraction of packets thrown away, to test on localhost
+        self.rng = random.Random(seed)
+
+        # Coins go to a pot of the session, the save file is never touched
+        self.player_data = copy.deepcopy(DEFAULT_PLAYER_DATA)
+        self.sim = Simulation(surfaces, self.player_data, seed, "sprites", len(COOP_SKINS))
+        self.clients = {} # address -> RemotePlayer
+        self.tick = 0
+        self.history = {} # tick -> field state, the baselines of the deltas
+        self.net_ids = {} # (pool, sprite serial) -> entity id
+        self.next_id = len(COOP_SKINS) + 1 # ships are 1, 2...
+        self.game_over_ticks = 0
+        self.tick_times = deque(maxlen=NET_TICK_RATE * 60) # ms spent in each tick
+        self.bad_packets = 0 # too short or malformed, dropped
+        self.running = True
+
+    def send(self, client, packet):
+        client.bytes_out += len(packet)
+        client.packets_out += 1
+        if self.loss and self.rng.random() < self.loss:
+            return
+        self.sock.sendto(packet, client.address)
+
+    def poll(self):
+        while True:
+            try:
+                data, address = self.sock.recvfrom(RECV_SIZE)
+            except (BlockingIOError, ConnectionResetError):
+                return
+            if data:
+                try:
+                    self.receive(data, address)
+                except (struct.error, IndexError, ValueError):
+                    self.bad_packets += 1
+
+    def receive(self, data, address):
+        client = self.clients.get(address)
+        if data[0] == JOIN and client is None:
+            used = [other.slot for other in self.clients.values()]
+            free = [slot for slot in range(len(COOP_SKINS)) if slot not in used]
+            if not free:
+                self.sock.sendto(bytes([FULL]), address)
+                return
+            client = self.clients[address] = RemotePlayer(address, free[0])
+            print(f"Joueur {client.slot + 1} connecté depuis {address[0]}:{address[1]}")
+        if client is None:
+            return
+        client.last_seen = time.perf_counter()
+        client.bytes_in += len(data)
+        client.packets_in += 1
+
+        if data[0] == JOIN: # sent again until the WELCOME arrives
+            upgrade_bits = sum(1 << index for index, name in enumerate(UPGRADES) if self.player_data["upgrades"][name])
+            self.send(client, WELCOME_PACKET.pack(WELCOME, client.slot, self.tick_rate, upgrade_bits))
+        elif data[0] == INPUT:
+            # Read whole before anything is applied, a truncated packet raises here
+            _, acked, count = INPUT_HEADER.unpack_from(data)
+            entries = [INPUT_ENTRY.unpack_from(data, INPUT_HEADER.size + index * INPUT_ENTRY.size) for index in range(count)]
+            client.acked = max(client.acked, acked)
+            for sequence, bits in entries:
+                if sequence > client.last_applied and sequence not in client.inputs:
+                    client.inputs[sequence] = (bits, self.tick)
+        elif data[0] == LEAVE:
+            self.drop(client, "parti")
+
+    def drop(self, client, reason):
+        print(f"Joueur {client.slot + 1} {reason}")
+        self.print_client(client.stats(self.tick_rate))
+        del self.clients[client.address]
+
+    def step(self):
+        start = time.perf_counter()
+        for client in list(self.clients.values()):
+            if start - client.last_seen > NET_TIMEOUT:
+                self.drop(client, "déconnecté (timeout)")
+        if not self.clients:
+            return # nobody plays, the game waits
+
+        controls = [PlayerInput()] * len(COOP_SKINS)
+        for client in self.clients.values():
+            controls[client.slot] = client.next_input(self.tick)
+        if self.sim.running:
+            self.sim.step(self.dt, *controls)
+        else:
+            self.game_over_ticks += 1
+            if self.game_over_ticks >= RESTART_DELAY * self.tick_rate:
+                print(f"Partie terminée, score {self.sim.score}, pièces {self.player_data['coins']}")
+                self.sim.reset()
+                self.game_over_ticks = 0
+
+        self.tick += 1
+        state = self.field_state()
+        self.history[self.tick] = state
+        self.history.pop(self.tick - NET_HISTORY, None)
+        for client in list(self.clients.values()):
+            self.send_snapshot(client, state)
+        self.tick_times.append((time.perf_counter() - start) * 1000)
+
+    def entity_id(self, pool, sprite, ids, taken):
+        key = (pool, sprite.serial)
+        entity_id = self.net_ids.get(key)
+        if entity_id is None:
+            # After the wrap, skip ids a sprite still has: the client would
+            # take the new entity for the old one
+            entity_id = self.next_id
+            while entity_id in taken:
+                entity_id = entity_id + 1 if entity_id < 0xFFFF else len(COOP_SKINS) + 1
+            self.next_id = entity_id + 1 if entity_id < 0xFFFF else len(COOP_SKINS) + 1
+            taken.add(entity_id)
+        ids[key] = entity_id
+        return entity_id
+
+    def field_state(self):
+        # entity id -> (kind, x, y, extra), in whole pixels
+        sim = self.sim
+        ids = {}
+        taken = set(self.net_ids.values()) # ids of the last tick, and the new ones of this one
+        state = {}
+        for slot, player in enumerate(sim.players):
+            if player.alive():
+                state[slot + 1] = (KINDS.index("ship"), *player.rect.center, slot)
+        for meteor in sim.meteor_sprites:
+            kind = KINDS.index("yellow_meteor" if meteor.is_powerup_carrier else "meteor")
+            state[self.entity_id("meteor", meteor, ids, taken)] = (kind, *meteor.rect.center, meteor_rotations.step_index(meteor.rotation))
+        for laser in sim.laser_sprites:
+            state[self.entity_id("laser", laser, ids, taken)] = (KINDS.index("laser"), *laser.rect.center, 0)
+        for explosion in sim.explosion_sprites:
+            frame = min(int(explosion.frame_index), len(explosion.frames) - 1)
+            state[self.entity_id("explosion", explosion, ids, taken)] = (KINDS.index("explosion"), *explosion.rect.center, frame)
+        for powerup in sim.powerup_sprites:
+            state[self.entity_id("powerup", powerup, ids, taken)] = (KINDS.index("powerup"), *powerup.rect.center, 0)
+        self.net_ids = ids # sprites gone since the last tick lose their id
+        return state
+
+    def send_snapshot(self, client, state):
+        # Relative to the newest snapshot the client has, if it is still in the history
+        baseline_tick = client.acked if client.acked in self.history else 0
+        removed, count, entries = encode_entities(state, self.history.get(baseline_tick, {}))
+        flags = int(self.sim.running) | int(self.sim.rapid_fire) << 1
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT, self.tick, baseline_tick, client.last_applied, self.sim.score,
+                                      self.player_data["coins"], flags, len(removed), count)
+        self.send(client, header + b''.join(ENTITY_ID.pack(entity_id) for entity_id in removed) + entries)
+        client.snapshots += 1
+        client.full_snapshots += not baseline_tick
+
+    def serve(self, seconds=None, report_interval=None):
+        start = next_tick = next_report = time.perf_counter()
+        while self.running and (seconds is None or time.perf_counter() - start < seconds):
+            select.select([self.sock], [], [], max(0, next_tick - time.perf_counter()))
+            self.poll()
+            now = time.perf_counter()
+            if now >= next_tick:
+                self.step()
+                next_tick += self.dt
+                if now - next_tick > 0.25: # too far behind, don't try to catch up
+                    next_tick = now
+            if report_interval and now >= next_report + report_interval and self.clients:
+                next_report = now
+                self.print_report()
+        self.sock.close()
+
+    def stats(self):
+        times = list(self.tick_times)
+        mean = sum(times) / len(times) if times else 0
+        budget = 1000 / self.tick_rate
+        return {
+            "tick": self.tick,
+            "tick_ms": round(mean, 3),
+            "tick_p95_ms": round(percentile(times, 0.95), 3),
+            "budget_ms": round(budget, 2),
+            # One core could run this many sessions like this one
+            "sessions_per_core": int(budget / mean) if mean else None,
+            "bad_packets": self.bad_packets,
+            "clients": [client.stats(self.tick_rate) for client in self.clients.values()],
+        }
+
+    def print_client(self, stats):
+        print(f"  joueur {stats['slot'] + 1}: envoi {stats['out_kb_s']} kB/s ({stats['snapshot_bytes']} o/snapshot, "
+              f"{stats['full_snapshots']}/{stats['snapshots']} complets), réception {stats['in_kb_s']} kB/s, "
+              f"attente des inputs {stats['input_delay_ticks']} ticks (p95 {stats['input_delay_p95_ms']} ms), "
+              f"{stats['repeated']} répétés, {stats['skipped']} sautés")
+
+    def print_report(self):
+        stats = self.stats()
+        print(f"Tick {stats['tick']}: {stats['tick_ms']} ms/tick (p95 {stats['tick_p95_ms']} ms, budget {stats['budget_ms']} ms), "
+              f"≈ {stats['sessions_per_core']} sessions par cœur, {stats['bad_packets']} paquets invalides")
+        for client in stats["clients"]:
+            self.print_client(client)
+
+# --- Client ---
+
+class CoopClient:
+    def __init__(self, server_address, surfaces=None, loss=0.0, seed=None):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(('', 0))
+        self.sock.setblocking(False)
+        self.server_address = server_address
+        self.surfaces = surfaces # only needed to draw
+        self.loss = loss
+        self.rng = random.Random(seed)
+
+        self.slot = None
+        self.tick_rate = NET_TICK_RATE
+        self.ship = None # own ship, moved by prediction
+        self.alive = False
+        self.tick = 0 # newest snapshot
+        self.history = {} # tick -> field state
+        self.entities = {}
+        self.score = self.coins = 0
+        self.running = True
+        self.rapid_fire = False
+
+        self.sequence = 0
+        self.pending = deque(maxlen=NET_TICK_RATE * 2) # (sequence, controls) the server hasn't applied yet
+        self.predicted = {} # sequence -> ship center after that input
+        self.sent_at = {} # sequence -> time, for the round trip
+
+        self.started = time.perf_counter()
+        self.bytes_in = self.packets_in = 0
+        self.bytes_out = self.packets_out = 0
+        self.snapshots = self.undecodable = 0
+        self.bad_packets = 0
+        self.round_trips = deque(maxlen=NET_TICK_RATE * 60) # ms from an input to the snapshot that applied it
+        self.corrections = 0
+        self.correction_px = 0
+
+    def send(self, packet):
+        self.bytes_out += len(packet)
+        self.packets_out += 1
+        if self.loss and self.rng.random() < self.loss:
+            return
+        self.sock.sendto(packet, self.server_address)
+
+    def connect(self, timeout=NET_TIMEOUT):
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            self.send(bytes([JOIN]))
+            select.select([self.sock], [], [], 0.2)
+            self.poll()
+            if self.slot is not None:
+                return True
+        return False
+
+    def leave(self):
+        for _ in range(3): # no answer to wait for, sent a few times in case one is lost
+            self.sock.sendto(bytes([LEAVE]), self.server_address)
+        self.sock.close()
+
+    def poll(self):
+        while True:
+            try:
+                data, address = self.sock.recvfrom(RECV_SIZE)
+            except (BlockingIOError, ConnectionResetError):
+                return
+            if not data:
+                continue
+            self.bytes_in += len(data)
+            self.packets_in += 1
+            if data[0] == FULL:
+                raise ConnectionError("La partie est complète")
+            try:
+                if data[0] == WELCOME and self.slot is None:
+                    self.welcome(data)
+                elif data[0] == SNAPSHOT and self.slot is not None:
+                    self.receive_snapshot(data)
+            except (struct.error, IndexError, ValueError):
+                self.bad_packets += 1 # too short or malformed, dropped
+
+    def welcome(self, data):
+        _, slot, tick_rate, upgrade_bits = WELCOME_PACKET.unpack(data)
+        if slot >= len(COOP_SKINS) or not tick_rate:
+            raise ValueError(f"WELCOME invalide (joueur {slot}, {tick_rate} ticks/s)")
+        self.slot, self.tick_rate = slot, tick_rate
+        self.dt = 1 / self.tick_rate
+        # Same ship as on the server (skin, upgrades), so the prediction moves it the same way
+        player_data = copy.deepcopy(DEFAULT_PLAYER_DATA)
+        for index, name in enumerate(UPGRADES):
+            player_data["upgrades"][name] = bool(upgrade_bits & (1 << index))
+        self.ship = Player((), player_data, skin=COOP_SKINS[self.slot], x=WINDOW_WIDTH * (self.slot + 1) / (len(COOP_SKINS) + 1))
+        self.alive = True
+
+    def receive_snapshot(self, data):
+        _, tick, baseline_tick, last_input, score, coins, flags, removed, count = SNAPSHOT_HEADER.unpack_from(data)
+        if tick <= self.tick:
+            return # late or duplicated
+        if baseline_tick and baseline_tick not in self.history:
+            self.undecodable += 1
+            return
+        self.entities = decode_entities(data, SNAPSHOT_HEADER.size, self.history.get(baseline_tick, {}), removed, count)
+        self.tick = tick
+        self.history[tick] = self.entities
+        for old in [old for old in self.history if old <= tick - NET_HISTORY]:
+            del self.history[old]
+        self.score, self.coins = score, coins
+        self.running, self.rapid_fire = bool(flags & 1), bool(flags & 2)
+        self.snapshots += 1
+        self.reconcile(last_input)
+
+    def send_input(self, controls):
+        # One input per server tick, applied to the own ship right away
+        self.sequence += 1
+        self.pending.append((self.sequence, controls))
+        if self.alive:
+            self.ship.controls = controls
+            self.ship.update(self.dt)
+        self.predicted[self.sequence] = self.ship.rect.center
+        self.sent_at[self.sequence] = time.perf_counter()
+        recent = list(self.pending)[-INPUT_REDUNDANCY:]
+        packet = INPUT_HEADER.pack(INPUT, self.tick, len(recent))
+        self.send(packet + b''.join(INPUT_ENTRY.pack(sequence, encode_input(controls)) for sequence, controls in recent))
+
+    def reconcile(self, last_input):
+        if last_input in self.sent_at:
+            self.round_trips.append((time.perf_counter() - self.sent_at[last_input]) * 1000)
+        self.sent_at = {sequence: sent for sequence, sent in self.sent_at.items() if sequence > last_input}
+        while self.pending and self.pending[0][0] <= last_input:
+            self.pending.popleft()
+        predicted = self.predicted.get(last_input)
+        self.predicted = {sequence: center for sequence, center in self.predicted.items() if sequence > last_input}
+
+        server_ship = self.entities.get(self.slot + 1)
+        was_alive, self.alive = self.alive, server_ship is not None
+        if server_ship is None or predicted == server_ship[1:3]:
+            return
+        if predicted is not None and was_alive: # not a new game
+            self.corrections += 1
+            self.correction_px += abs(predicted[0] - server_ship[1]) + abs(predicted[1] - server_ship[2])
+        # Start again from the server position with the inputs it hasn't applied yet
+        previous = self.ship.previous_center
+        self.ship.rect.center = server_ship[1:3]
+        for sequence, controls in self.pending:
+            self.ship.controls = controls
+            self.ship.update(self.dt)
+            self.predicted[sequence] = self.ship.rect.center
+        self.ship.previous_center = previous
+
+    def entity_image(self, kind, extra):
+        name = KINDS[kind]
+        if name == "ship":
+            return assets.skin(COOP_SKINS[extra] or "default")
+        if name in ("meteor", "yellow_meteor"):
+            return meteor_rotations.get(self.surfaces[name], extra * meteor_rotations.step)
+        if name == "explosion":
+            return self.surfaces["explosion"][extra]
+        if name == "laser":
+            return self.surfaces["laser"]
+        return assets.image('powerup')
+
+    def blit_list(self, alpha=1.0):
+        # The field of the newest snapshot, with the own ship where the prediction has it
+        blits = []
+        for entity_id, (kind, x, y, extra) in self.entities.items():
+            if entity_id != self.slot + 1:
+                image = self.entity_image(kind, extra)
+                blits.append((image, image.get_rect(center=(x, y))))
+        if self.alive:
+            (x0, y0), (x1, y1) = self.ship.previous_center, self.ship.rect.center
+            blits.append((self.ship.image, self.ship.image.get_rect(center=(x0 + (x1 - x0) * alpha, y0 + (y1 - y0) * alpha))))
+        return blits
+
+    def stats(self):
+        seconds = time.perf_counter() - self.started
+        round_trips = list(self.round_trips)
+        return {
+            "slot": self.slot,
+            "in_kb_s": round(traffic(self.bytes_in, self.packets_in, seconds), 2),
+            "out_kb_s": round(traffic(self.bytes_out, self.packets_out, seconds), 2),
+            "snapshots": self.snapshots,
+            "undecodable": self.undecodable,
+            "bad_packets": self.bad_packets,
+            "round_trip_ms": round(sum(round_trips) / len(round_trips), 1) if round_trips else 0,
+            "round_trip_p95_ms": round(percentile(round_trips, 0.95), 1),
+            "corrections": self.corrections,
+            "correction_px": round(self.correction_px / self.corrections, 1) if self.corrections else 0,
+        }
+
+    def print_report(self):
+        stats = self.stats()
+        print(f"Client joueur {stats['slot'] + 1}: réception {stats['in_kb_s']} kB/s, envoi {stats['out_kb_s']} kB/s, "
+              f"{stats['snapshots']} snapshots ({stats['undecodable']} sans base, {stats['bad_packets']} invalides), "
+              f"input -> snapshot {stats['round_trip_ms']} ms (p95 {stats['round_trip_p95_ms']} ms), "
+              f"{stats['corrections']} corrections de prédiction ({stats['correction_px']} px en moyenne)")
+
+def coop_pilot(client):
+    # chase_pilot on the field of the snapshots: under the lowest meteor above the ship
+    ship = client.ship.rect
+    target = None
+    for kind, x, y, extra in client.entities.values():
+        if KINDS[kind] in ("meteor", "yellow_meteor") and y < ship.top and (target is None or y > target[1]):
+            target = (x, y)
+    left = right = False
+    if target is not None:
+        left = target[0] < ship.centerx - 10
+        right = target[0] > ship.centerx + 10
+    return PlayerInput(left=left, right=right, fire=True, fire_pressed=True)
+
+def play_window(client):
+    # Keyboard client: inputs at the server tick rate, drawn at RENDER_FPS
+    display_surface = pygame.display.get_surface()
+    clock = pygame.time.Clock()
+    stepper = FixedStep(client.tick_rate)
+    fire_pressed = False
+    playing = True
+    while playing:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                playing = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+                fire_pressed = True # held until an input is sent
+        client.poll()
+        for _ in range(stepper.advance(clock.tick(RENDER_FPS) / 1000)):
+            client.send_input(read_player_input(fire_pressed))
+            fire_pressed = False
+
+        display_surface.fill(GAME_BACKGROUND_COLOR)
+        display_surface.blits(client.blit_list(stepper.alpha))
+        score_text = render_text(f"{client.score}   Pièces: {client.coins}", 30, (240, 240, 240))
+        display_surface.blit(score_text, score_text.get_rect(midbottom=(WINDOW_WIDTH / 2, WINDOW_HEIGHT - 30)))
+        if not client.running:
+            over_text = render_text("Partie terminée", 60, (220, 20, 60))
+            display_surface.blit(over_text, over_text.get_rect(center=(WINDOW_WIDTH / 2, WINDOW_HEIGHT / 2)))
+        pygame.display.update()
+    client.leave()
+
+def run_local_test(seconds, tick_rate=NET_TICK_RATE, seed=1, loss=0.0):
+    # Server and two scripted clients on localhost, then the reports of both sides
+    init_headless()
+    server = CoopServer(load_game_surfaces(), ('127.0.0.1', 0), tick_rate, seed, loss)
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+
+    clients = [CoopClient(server.address, loss=loss, seed=seed + index + 1) for index in range(len(COOP_SKINS))]
+    for client in clients:
+        if not client.connect():
+            raise ConnectionError("Pas de réponse du serveur")
+    start = next_tick = time.perf_counter()
+    dt = 1 / clients[0].tick_rate
+    while time.perf_counter() - start < seconds:
+        select.select([client.sock for client in clients], [], [], max(0, next_tick - time.perf_counter()))
+        for client in clients:
+            client.poll()
+        if time.perf_counter() >= next_tick:
+            next_tick += dt
+            for client in clients:
+                client.send_input(coop_pilot(client))
+
+    server.running = False
+    thread.join()
+    server.print_report()
+    for client in clients:
+        client.print_report()
+        client.sock.close()
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="LAN co-op: authoritative server, keyboard client or a localhost test")
+    modes = parser.add_subparsers(dest='mode', required=True)
+    server_parser = modes.add_parser('server', help="run the game for two clients")
+    server_parser.add_argument('--host', default='0.0.0.0')
+    client_parser = modes.add_parser('client', help="join a server with a window")
+    client_parser.add_argument('--host', default='127.0.0.1')
+    test_parser = modes.add_parser('test', help="server and two scripted clients on localhost")
+    test_parser.add_argument('--seconds', type=float, default=10)
+    for mode_parser in [server_parser, client_parser]:
+        mode_parser.add_argument('--port', type=int, default=NET_PORT)
+    for mode_parser in [server_parser, client_parser, test_parser]:
+        mode_parser.add_argument('--loss', type=float, default=0.0, help="fraction of packets dropped on purpose")
+    for mode_parser in [server_parser, test_parser]:
+        mode_parser.add_argument('--tick-rate', type=int, default=NET_TICK_RATE)
+        mode_parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    if args.mode == 'server':
+        init_headless()
+        server = CoopServer(load_game_surfaces(), (args.host, args.port), args.tick_rate, args.seed, args.loss)
+        print(f"Serveur co-op sur le port {server.address[1]}, {args.tick_rate} ticks/s")
+        try:
+            server.serve(report_interval=REPORT_INTERVAL)
+        except KeyboardInterrupt:
+            server.print_report()
+    elif args.mode == 'client':
+        pygame.init()
+        pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        pygame.display.set_caption("Le Justicier de la Galaxie - co-op")
+        assets.load_pack()
+        client = CoopClient((args.host, args.port), load_game_surfaces(), args.loss)
+        if not client.connect():
+            raise SystemExit(f"Pas de serveur sur {args.host}:{args.port}")
+        play_window(client)
+        client.print_report()
+    else:
+        run_local_test(args.seconds, args.tick_rate, args.seed, args.loss)
@@ -0,0 +1,154 @@
+import math
+import pygame
+
+from settings import WINDOW_WIDTH, WINDOW_HEIGHT, MAX_PARTICLES
+from entity_arrays import np
+
+# --- Particle System ---
+# Explosions and engine trails made of glowing points instead of the 21
+# frames of AnimatedExplosion. Particles live in flat NumPy arrays (position,
+# velocity, age, life time) that are moved and culled all at once, and there
+# is a hard cap: past `capacity` live particles, new ones are dropped. When
+# frames go over budget the spawn director gives explosions fewer particles.
+#
+# Drawing doesn't blit one image per particle: the heat of every particle is
+# summed into a half resolution 8-bit layer (np.bincount), a fire palette
+# turns heat into color (dark red, then orange, yellow and white where many
+# overlap) and only the tiles of the layer that hold particles are scaled and
+# added onto the window, merged into a few separate rects (additive blits or
+# texture draws), so two explosions far apart don't dirty the screen between them.
+#
+# Cosmetic only: particles have their own random generator, so a game plays
+# the same with or without them (replays).
+
+LAYER_SCALE = 2 # window pixels per layer pixel
+HEAT = 90 # palette index of a new particle, fades to 0 over its life
+TILE = 32 # layer pixels, size of the blocks the drawn areas are made of
+DRAG = 2.5 # share of the speed lost per second
+
+EXPLOSION_PARTICLES = 80
+EXPLOSION_SPEED = (60, 420) # px/s
+EXPLOSION_LIFE = (0.35, 0.9) # s
+TRAIL_PARTICLES = 2 # per ship and step
+TRAIL_SPEED = (120, 220)
+TRAIL_LIFE = (0.15, 0.35)
+TRAIL_SPREAD = 0.3 # radians around straight down
+
+def fire_palette():
+    # Index 0 is black so empty pixels add nothing
+    return [(min(255, i * 3), min(255, max(0, (i - 60) * 2)), min(255, max(0, (i - 160) * 3))) for i in range(256)]
+
+class ParticleSystem:
+    def __init__(self, capacity=MAX_PARTICLES, seed=None):
+        self.capacity = capacity
+        self.columns = [np.zeros(capacity) for _ in range(6)]
+        self.x, self.y, self.vx, self.vy, self.age, self.life = self.columns
+        self.count = 0
+        self.rng = np.random.default_rng(seed)
+
+        self.layer_size = (WINDOW_WIDTH // LAYER_SCALE, WINDOW_HEIGHT // LAYER_SCALE)
+        self.layer = pygame.Surface(self.layer_size, depth=8)
+        self.layer.set_palette(fire_palette())
+        self.colors = pygame.Surface((1, 1)) # 32-bit format the layer is converted to
+
+        self.emitted = 0
+        self.dropped = 0 # not emitted because of the cap
+
+    def emit(self, position, count, speed, life, direction=0.0, spread=math.pi):
+        new = min(count, self.capacity - self.count)
+        self.dropped += count - new
+        if new <= 0:
+            return
+        angle = self.rng.uniform(direction - spread, direction + spread, new)
+        velocity = self.rng.uniform(*speed, new)
+        part = slice(self.count, self.count + new)
+        self.x[part], self.y[part] = position
+        self.vx[part] = np.cos(angle) * velocity
+        self.vy[part] = np.sin(angle) * velocity
+        self.age[part] = 0
+        self.life[part] = self.rng.uniform(*life, new)
+        self.count += new
+        self.emitted += new
+
+    def explode(self, center, scale=1.0):
+        # scale < 1 on slow frames (SpawnDirector.particle_scale)
+        self.emit(center, max(1, round(EXPLOSION_PARTICLES * scale)), EXPLOSION_SPEED, EXPLOSION_LIFE)
+
+    def trail(self, position):
+        # Out of the back of a ship, downwards (y grows downwards)
+        self.emit(position, TRAIL_PARTICLES, TRAIL_SPEED, TRAIL_LIFE, math.pi / 2, TRAIL_SPREAD)
+
+    def update(self, dt):
+        n = self.count
+        if not n:
+            return
+        x, y, vx, vy, age, life = (column[:n] for column in self.columns)
+        x += vx * dt
+        y += vy * dt
+        damping = max(0.0, 1 - DRAG * dt)
+        vx *= damping
+        vy *= damping
+        age += dt
+        alive = (age < life) & (x >= 0) & (x < WINDOW_WIDTH) & (y >= 0) & (y < WINDOW_HEIGHT)
+        kept = int(alive.sum())
+        if kept < n:
+            for column in self.columns:
+                column[:kept] = column[:n][alive]
+            self.count = kept
+
+    def clear(self):
+        self.count = 0
+
+    def images(self):
+        # [(surface, position)] to add onto the window, empty without particles
+        n = self.count
+        if not n:
+            return []
+        width, height = self.layer_size
+        # Clipped: particles emitted off screen are only culled by the next update
+        column = np.clip(self.x[:n] // LAYER_SCALE, 0, width - 1).astype(np.intp)
+        row = np.clip(self.y[:n] // LAYER_SCALE, 0, height - 1).astype(np.intp)
+        heat = HEAT * (1 - self.age[:n] / self.life[:n])
+        pixels = np.bincount(column * height + row, weights=heat, minlength=width * height)
+        pygame.surfarray.blit_array(self.layer, np.minimum(pixels, 255).astype(np.uint8).reshape(width, height))
+
+        # Only the areas around the particles are scaled, converted to 32 bits
+        # first (adding from 8 bits is very slow)
+        images = []
+        for area in self.areas(column, row):
+            colored = self.layer.subsurface(area).convert(self.colors)
+            scaled = pygame.transform.scale(colored, (area.width * LAYER_SCALE, area.height * LAYER_SCALE))
+            images.append((scaled, (area.x * LAYER_SCALE, area.y * LAYER_SCALE)))
+        return images
+
+    def areas(self, column, row):
+        # Layer rects covering every tile with a particle, never overlapping
+        # (the heat would be added twice): runs of tiles along each row,
+        # merged with the run just above when they span the same columns
+        width, height = self.layer_size
+        tiles = np.zeros((-(-height // TILE), -(-width // TILE)), dtype=bool)
+        tiles[row // TILE, column // TILE] = True
+        areas = []
+        above = {} # (first, end) tile columns -> rect from the row above
+        for tile_row, occupied in enumerate(tiles.tolist()):
+            runs = {}
+            first = None
+            for tile_column, used in enumerate(occupied + [False]):
+                if used and first is None:
+                    first = tile_column
+                elif not used and first is not None:
+                    span = (first, tile_column)
+                    rect = above.get(span)
+                    if rect is not None:
+                        rect.height += TILE
+                    else:
+                        rect = pygame.Rect(first * TILE, tile_row * TILE, (tile_column - first) * TILE, TILE)
+                        areas.append(rect)
+                    runs[span] = rect
+                    first = None
+            above = runs
+        layer_rect = self.layer.get_rect()
+        return [rect.clip(layer_rect) for rect in areas]
+
+    def stats(self):
+        return {"live": self.count, "emitted": self.emitted, "dropped": self.dropped}
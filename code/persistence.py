@@ -0,0 +1,86 @@
+import os
+import copy
+import json
+import threading
+
+from settings import DEFAULT_PLAYER_DATA
+
+# --- Player Data Persistence ---
+# The game only marks the save data as dirty; a background thread writes it
+# every few seconds, and the game also flushes it on screen changes and at
+# exit. Files are written to a temporary file and then renamed over the old
+# one, so a crash mid-write can never leave a half-written save.
+
+PLAYER_DATA_FILE = 'save_data.json'
+FLUSH_INTERVAL = 2.0 # seconds between two background saves
+
+def load_json(path, default):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return copy.deepcopy(default)
+
+def atomic_write_json(path, data):
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump(data, f, indent=4)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path) # atomic on the same disk
+
+class PlayerDataStore:
+    def __init__(self, path=PLAYER_DATA_FILE, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        # Default data if file doesn't exist or is corrupted
+        self.data = load_json(path, DEFAULT_PLAYER_DATA)
+
+        self.dirty = False
+        self.writes = 0
+        self.lock = threading.Lock() # one write at a time
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def mark_dirty(self):
+        self.dirty = True
+
+    def flush(self):
+        with self.lock:
+            if not self.dirty:
+                return False
+            self.dirty = False
+            try:
+                # Copied first: the game keeps changing the data while the file is written
+                snapshot = copy.deepcopy(self.data)
+            except RuntimeError:
+                # Data changed size during the copy, try again next time
+                self.dirty = True
+                return False
+            try:
+                atomic_write_json(self.path, snapshot)
+            except OSError:
+                self.dirty = True
+                raise
+            self.writes += 1
+            return True
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="save-data", daemon=True)
+            self.thread.start()
+
+    def close(self):
+        # Stops the background thread and writes anything left
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.flush()
+
+    def _run(self):
+        while not self.stop_event.wait(self.flush_interval):
+            try:
+                self.flush()
+            except OSError as error:
+                print(f"Sauvegarde impossible : {error}")
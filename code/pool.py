@@ -0,0 +1,55 @@
+import pygame
+
+# --- Sprite Pools ---
+# Lasers, meteors, explosions and power-ups are created and killed all game
+# long. A pool keeps killed sprites and hands them back, reset, the next time
+# one is needed, instead of allocating a new sprite, rect and group entries.
+
+DEFAULT_POOL_SIZE = 512 # killed sprites kept per pool
+
+class PooledSprite(pygame.sprite.Sprite):
+    # Subclasses define reset(*args), which sets the sprite up like __init__
+    # does (without the groups): SpritePool.get() calls it on every sprite
+    # it hands out, new or reused
+    pool = None
+
+    def kill(self):
+        was_alive = self.alive() # kill() can be called twice in one frame
+        super().kill()
+        if was_alive and self.pool is not None:
+            self.pool.release(self)
+
+class SpritePool:
+    def __init__(self, sprite_class, size=DEFAULT_POOL_SIZE):
+        self.sprite_class = sprite_class
+        self.size = size
+        self.free = []
+        self.serial = 0 # counts every get(), tells a reused sprite from its previous life
+
+        self.hits = 0 # sprites reused
+        self.created = 0 # pool had to grow
+        self.dropped = 0 # killed while the pool was full
+
+    def get(self, groups, *args):
+        if self.free:
+            sprite = self.free.pop()
+            self.hits += 1
+        else:
+            sprite = self.sprite_class.__new__(self.sprite_class)
+            pygame.sprite.Sprite.__init__(sprite)
+            sprite.pool = self
+            self.created += 1
+        self.serial += 1
+        sprite.serial = self.serial
+        sprite.reset(*args)
+        sprite.add(groups)
+        return sprite
+
+    def release(self, sprite):
+        if len(self.free) < self.size:
+            self.free.append(sprite)
+        else:
+            self.dropped += 1
+
+    def stats(self):
+        return {"free": len(self.free), "hits": self.hits, "created": self.created, "dropped": self.dropped}
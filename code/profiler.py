@@ -0,0 +1,176 @@
+import csv
+import json
+import pstats
+import cProfile
+from collections import deque
+from time import perf_counter
+
+import pygame
+
+from settings import METRICS_FILE, PROFILE_FRAMES, PROFILE_FILE
+from frame_timer import FrameTimer, NULL_TIMER, percentile
+from text_cache import fonts
+from sprites import meteor_rotations
+
+# --- Profiler ---
+# F3 in game shows an overlay with the time spent in each phase of a frame,
+# how many entities are alive, the meteor masks built or reused from the
+# rotation cache and the memory (code/memory_tracker.py). While it is on,
+# every frame is recorded and written to METRICS_FILE (.csv or .json) when
+# the game ends. When it is off the game uses the NullFrameTimer, so it
+# costs next to nothing. Times are recorded in milliseconds.
+# PROFILE_FRAMES = (first, last) runs cProfile on those frames of a game.
+
+PHASES = ["events", "update", "collisions", "powerups", "draw", "score", "display"]
+COUNTS = ["meteor_count", "laser_count", "powerup_count", "explosion_count", "particle_count", "masks_built", "masks_reused"]
+OVERLAY_FRAMES = 120 # frames averaged in the overlay
+OVERLAY_REFRESH = 250 # ms between two refreshes of the overlay text
+MAX_RECORDED_FRAMES = 36000 # 10 minutes at 60 fps
+
+class Profiler:
+    def __init__(self, metrics_path=METRICS_FILE, profile_frames=PROFILE_FRAMES, profile_path=PROFILE_FILE):
+        self.metrics_path = metrics_path
+        self.profile_frames = profile_frames
+        self.profile_path = profile_path
+
+        self.enabled = False
+        self.wanted = False # toggles apply at the start of the next frame
+        self.timer = NULL_TIMER
+        self.frame_timer = FrameTimer()
+        self.rows = [] # recorded frames of the current game
+        self.recent = deque(maxlen=OVERLAY_FRAMES)
+        self.frame = 0 # frames since the game started
+        self.frame_start = 0
+
+        self.memory = None # MemoryTracker shown in the overlay
+        self.profile = None
+        self.panel = None
+        self.last_refresh = None
+
+    def toggle(self):
+        self.wanted = not self.wanted
+
+    def new_game(self):
+        self.frame = 0
+        self.rows = []
+
+    def begin_frame(self):
+        self.frame += 1
+        if self.wanted != self.enabled:
+            self.enabled = self.wanted
+            self.timer = self.frame_timer if self.enabled else NULL_TIMER
+            self.frame_timer.reset()
+            self.recent.clear()
+            self.last_refresh = None
+        if self.profile_frames is not None:
+            self._profile_range()
+        if self.enabled:
+            self.frame_start = perf_counter()
+
+    def end_frame(self, sim):
+        if not self.enabled:
+            return
+        times = self.frame_timer.current
+        self.frame_timer.current = {}
+        row = {"frame": self.frame, "total": round((perf_counter() - self.frame_start) * 1000, 3)}
+        for phase in PHASES:
+            row[phase] = round(times.get(phase, 0) * 1000, 3)
+        row["meteor_count"] = sim.meteor_count()
+        row["laser_count"] = sim.laser_count()
+        row["powerup_count"] = len(sim.powerup_sprites)
+        row["explosion_count"] = len(sim.explosion_sprites)
+        row["particle_count"] = sim.particles.count if sim.particles is not None else 0
+        # Rotated meteor masks built or taken from the cache this frame
+        row["masks_built"] = meteor_rotations.last_frame_masks["built"]
+        row["masks_reused"] = meteor_rotations.last_frame_masks["reused"]
+        self.recent.append(row)
+        if len(self.rows) < MAX_RECORDED_FRAMES:
+            self.rows.append(row)
+
+    def draw(self, surface):
+        # Returns the area drawn, for the renderer's dirty rects
+        now = pygame.time.get_ticks()
+        if self.panel is None or self.last_refresh is None or now - self.last_refresh >= OVERLAY_REFRESH:
+            self.panel = self._render_panel()
+            self.last_refresh = now
+        return surface.blit(self.panel, (10, 10))
+
+    def finish_game(self):
+        # Stops a cProfile run cut short and writes the metrics of the game
+        if self.profile is not None:
+            self._stop_profile()
+        if self.rows:
+            self.export()
+
+    def summary(self, rows=None):
+        rows = self.rows if rows is None else rows
+        result = {}
+        for name in ["total"] + PHASES:
+            values = [row[name] for row in rows]
+            result[name] = {
+                "mean_ms": round(sum(values) / len(values), 3) if values else 0,
+                "p95_ms": percentile(values, 0.95),
+                "max_ms": max(values, default=0),
+            }
+        return result
+
+    def export(self, path=None):
+        path = path or self.metrics_path
+        if path.endswith('.json'):
+            with open(path, 'w') as f:
+                json.dump({"summary": self.summary(), "frames": self.rows}, f, indent=1)
+        else:
+            with open(path, 'w', newline='') as f:
+                writer = csv.DictWriter(f, ["frame", "total"] + PHASES + COUNTS)
+                writer.writeheader()
+                writer.writerows(self.rows)
+        print(f"Métriques de {len(self.rows)} frames écrites dans {path}")
+
+    def _render_panel(self):
+        font = fonts.get(16)
+        rows = list(self.recent)
+        lines = []
+        if rows:
+            total = sum(row["total"] for row in rows) / len(rows)
+            lines.append(f"frame {total:6.2f} ms  ({1000 / total if total else 0:.0f} fps)")
+            for phase in PHASES:
+                lines.append(f"{phase:<11}{sum(row[phase] for row in rows) / len(rows):6.2f} ms")
+            last = rows[-1]
+            lines.append(f"meteors {last['meteor_count']}  lasers {last['laser_count']}  "
+                         f"power-ups {last['powerup_count']}  explosions {last['explosion_count']}")
+            lines.append(f"particles {last['particle_count']}")
+            lines.append(f"masks built {sum(row['masks_built'] for row in rows) / len(rows):.1f}  "
+                         f"reused {sum(row['masks_reused'] for row in rows) / len(rows):.1f} /frame  "
+                         f"(prerender {meteor_rotations.masks_prebuilt})")
+            if self.memory is not None:
+                lines.append(self.memory.overlay_line())
+        else:
+            lines.append("profiler...")
+
+        texts = [font.render(line, True, (240, 240, 240)) for line in lines]
+        width = max(text.get_width() for text in texts) + 16
+        height = sum(text.get_height() for text in texts) + 12
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 170))
+        y = 6
+        for text in texts:
+            panel.blit(text, (8, y))
+            y += text.get_height()
+        return panel
+
+    def _profile_range(self):
+        first, last = self.profile_frames
+        if self.frame == first and self.profile is None:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+        elif self.frame == last + 1 and self.profile is not None:
+            self._stop_profile()
+
+    def _stop_profile(self):
+        self.profile.disable()
+        self.profile.dump_stats(self.profile_path)
+        print(f"cProfile des frames {self.profile_frames[0]} à {min(self.frame - 1, self.profile_frames[1])} "
+              f"écrit dans {self.profile_path}")
+        pstats.Stats(self.profile).sort_stats('cumulative').print_stats(15)
+        self.profile = None
+        self.profile_frames = None # one run per session
@@ -0,0 +1,99 @@
+import pygame
+
+from settings import WINDOW_WIDTH, WINDOW_HEIGHT
+
+# --- Layered Renderer ---
+# The background color and the stars never change during a game, so they are
+# baked once into a surface. Each frame only the areas covered by sprites
+# (this frame and the last one) are restored from it, redrawn and sent to
+# pygame.display.update, instead of refilling and pushing the whole window.
+
+GAME_BACKGROUND_COLOR = '#3a2e3f'
+# Past these limits redrawing and pushing the whole window is cheaper
+MAX_DIRTY_RECTS = 200
+MAX_DIRTY_AREA = 0.5 # fraction of the window covered by the dirty rects
+
+class LayeredRenderer:
+    name = "surface"
+
+    def __init__(self, display_surface, background_color=GAME_BACKGROUND_COLOR, use_dirty_rects=True):
+        self.display_surface = display_surface
+        self.background_color = background_color
+        self.use_dirty_rects = use_dirty_rects
+        self.screen_rect = display_surface.get_rect()
+        self.background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT)).convert()
+        self.background.fill(background_color)
+
+        self.last_rects = [] # drawn last frame, to erase this frame
+        self.rects = [] # drawn this frame
+        self.full_redraw = True
+        self.full_frames = 0 # frames that fell back to a full redraw
+
+    def bake_background(self, static_sprites):
+        # Call again whenever the stars change (new game)
+        self.background.fill(self.background_color)
+        static_sprites.draw(self.background)
+        self.invalidate()
+
+    def invalidate(self):
+        # Next frame redraws and pushes the whole window (after a menu for instance)
+        self.full_redraw = True
+
+    def begin_frame(self):
+        self.rects = []
+        if not self.full_redraw and self.use_dirty_rects and self.too_dirty(self.last_rects):
+            self.full_redraw = True
+        if self.full_redraw or not self.use_dirty_rects:
+            self.full_frames += 1
+            self.display_surface.blit(self.background, (0, 0))
+        else:
+            for rect in self.last_rects:
+                self.display_surface.blit(self.background, rect, rect)
+
+    def draw_game(self, sim, alpha=1.0):
+        self.draw_blits(sim.blit_list(alpha))
+        if sim.particles is not None:
+            self.draw_additive(sim.particles.images())
+
+    def draw_additive(self, images):
+        # (surface, position) pairs added onto the window (particle areas),
+        # each one its own dirty rect
+        for surface, position in images:
+            self.rects.append(self.display_surface.blit(surface, position, special_flags=pygame.BLEND_RGB_ADD))
+
+    def draw_sprites(self, sprites):
+        self.draw_blits([(sprite.image, sprite.rect) for sprite in sprites])
+
+    def draw_blits(self, blits):
+        # (image, position) pairs, drawn in one Surface.blits call
+        drawn = self.display_surface.blits(blits)
+        self.rects.extend(drawn)
+
+    def add_rect(self, rect):
+        # For things drawn directly on the display surface (score box...)
+        self.rects.append(rect)
+
+    def end_frame(self):
+        rects = [rect.clip(self.screen_rect) for rect in self.rects]
+        rects = [rect for rect in rects if rect.width and rect.height]
+
+        if self.full_redraw or not self.use_dirty_rects or self.too_dirty(rects):
+            pygame.display.update()
+        else:
+            pygame.display.update(self.last_rects + rects)
+
+        self.last_rects = rects
+        self.full_redraw = False
+
+    def present(self):
+        # Menus: the whole window, as drawn on the display surface
+        pygame.display.update()
+
+    def set_icon(self, surface):
+        pygame.display.set_icon(surface)
+
+    def too_dirty(self, rects):
+        if len(rects) > MAX_DIRTY_RECTS:
+            return True
+        area = sum(rect.width * rect.height for rect in rects)
+        return area > MAX_DIRTY_AREA * self.screen_rect.width * self.screen_rect.height
@@ -0,0 +1,161 @@
+import os
+import sys
+import copy
+import time
+import zlib
+import shutil
+import struct
+import argparse
+
+from settings import *
+from sprites import PlayerInput
+from simulation import Simulation, init_headless, load_game_surfaces
+
+# --- Input Recording and Replay ---
+# main_game() records the input of every simulation step (arrows, shift,
+# space) with the seed of the game. Since the simulation only depends on its
+# seed, its input and the starting player data, a replay re-runs the game
+# headless as fast as possible and must end with the same score and coins.
+# Recordings worth keeping as regression fixtures (long games, rapid fire...)
+# are copied to REPLAY_FIXTURE_DIR with --fixture: that folder is kept in git
+# and never pruned. A new VERSION makes every recording stale, the fixtures
+# then have to be recorded again.
+#
+# File format (little endian):
+#   header: magic, version, seed (u64), steps per second (u16), backend (u8),
+#           starting coins (u32), upgrades (u8 bits), skin name (u8 length + utf-8)
+#   footer: steps (u32), final score (u32), final coins (u32)
+#   then the zlib-compressed input of each step, one byte per step
+
+MAGIC = b'LJGR'
+VERSION = 2 # 2: meteors follow the difficulty curve
+HEADER = struct.Struct('<4sBQHBIBB')
+FOOTER = struct.Struct('<III')
+BACKENDS = ["sprites", "numpy"]
+UPGRADES = ["slower_cooldown", "faster_movement_speed"]
+
+def encode_input(controls):
+    # One bit per PlayerInput field
+    bits = 0
+    for index, pressed in enumerate(controls):
+        if pressed:
+            bits |= 1 << index
+    return bits
+
+def decode_input(bits):
+    return PlayerInput(*(bool(bits & (1 << index)) for index in range(len(PlayerInput._fields))))
+
+class InputRecorder:
+    def __init__(self, seed, rate, player_data, backend=ENTITY_BACKEND):
+        self.seed = seed
+        self.rate = rate
+        self.backend = backend
+        self.coins = player_data["coins"]
+        self.upgrades = [name for name in UPGRADES if player_data["upgrades"].get(name)]
+        self.skin = player_data["selected_skin"]
+        self.inputs = bytearray()
+
+    def record(self, controls):
+        self.inputs.append(encode_input(controls))
+
+    def save(self, path, score, coins):
+        upgrade_bits = sum(1 << UPGRADES.index(name) for name in self.upgrades)
+        skin = self.skin.encode('utf-8')
+        header = HEADER.pack(MAGIC, VERSION, self.seed, self.rate, BACKENDS.index(self.backend),
+                             self.coins, upgrade_bits, len(skin))
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(header + skin)
+            f.write(FOOTER.pack(len(self.inputs), score, coins))
+            f.write(zlib.compress(bytes(self.inputs), 9))
+
+def load_replay(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, seed, rate, backend, coins, upgrade_bits, skin_length = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("pas un fichier replay")
+    if version != VERSION:
+        raise ValueError(f"replay de la version {version}, pas {VERSION}")
+    offset = HEADER.size
+    skin = data[offset:offset + skin_length].decode('utf-8')
+    offset += skin_length
+    steps, score, final_coins = FOOTER.unpack_from(data, offset)
+    inputs = zlib.decompress(data[offset + FOOTER.size:])
+    if len(inputs) != steps:
+        raise ValueError("replay incomplet")
+
+    player_data = copy.deepcopy(DEFAULT_PLAYER_DATA)
+    player_data["coins"] = coins
+    player_data["selected_skin"] = skin
+    for index, name in enumerate(UPGRADES):
+        player_data["upgrades"][name] = bool(upgrade_bits & (1 << index))
+    return {
+        "seed": seed, "rate": rate, "backend": BACKENDS[backend], "player_data": player_data,
+        "inputs": inputs, "score": score, "coins": final_coins,
+    }
+
+def replay_path(folder=REPLAY_DIR):
+    return os.path.join(folder, time.strftime('%Y-%m-%d_%H-%M-%S') + '.replay')
+
+def read_version(path):
+    # Version of a replay file, None if it isn't one
+    try:
+        with open(path, 'rb') as f:
+            magic, version = struct.unpack('<4sB', f.read(5))
+    except (OSError, struct.error):
+        return None
+    return version if magic == MAGIC else None
+
+def prune_replays(folder=REPLAY_DIR, keep=REPLAY_KEEP):
+    # Recordings of another version can't be replayed, and only the most
+    # recent ones are kept (REPLAY_FIXTURE_DIR is never pruned)
+    names = sorted(name for name in os.listdir(folder) if name.endswith('.replay'))
+    stale = [name for name in names if read_version(os.path.join(folder, name)) != VERSION]
+    current = [name for name in names if name not in stale]
+    for name in stale + (current[:-keep] if keep else []):
+        os.remove(os.path.join(folder, name))
+
+def run_replay(replay, surfaces, backend=None):
+    # Re-simulates a loaded replay, returns the simulation at the end
+    sim = Simulation(surfaces, replay["player_data"], replay["seed"], backend or replay["backend"])
+    dt = 1 / replay["rate"]
+    inputs = [decode_input(bits) for bits in range(1 << len(PlayerInput._fields))]
+    for bits in replay["inputs"]:
+        sim.step(dt, inputs[bits])
+    return sim
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Replay recorded games headless and check their result")
+    parser.add_argument('paths', nargs='+')
+    parser.add_argument('--backend', choices=BACKENDS, help="override the backend of the recording; the backends are not step-identical, expect mismatches")
+    parser.add_argument('--fixture', action='store_true', help=f"copy the recordings that check out to {REPLAY_FIXTURE_DIR}")
+    args = parser.parse_args()
+
+    init_headless()
+    surfaces = load_game_surfaces()
+    failed = skipped = 0
+    for path in args.paths:
+        try:
+            replay = load_replay(path)
+        except (OSError, ValueError, struct.error, zlib.error) as error:
+            # Old version or damaged file: reported, the others are still checked
+            print(f"IGNORÉ {path}: {error}")
+            skipped += 1
+            continue
+        start = time.perf_counter()
+        sim = run_replay(replay, surfaces, args.backend)
+        elapsed = time.perf_counter() - start
+        ok = sim.score == replay["score"] and sim.player_data["coins"] == replay["coins"]
+        failed += not ok
+        print(f"{'OK ' if ok else 'ERREUR'} {path}: {len(replay['inputs'])} steps in {elapsed:.2f} s "
+              f"({len(replay['inputs']) / max(elapsed, 1e-6):.0f} steps/s), score {sim.score}/{replay['score']}, "
+              f"coins {sim.player_data['coins']}/{replay['coins']}")
+        if ok and args.fixture:
+            os.makedirs(REPLAY_FIXTURE_DIR, exist_ok=True)
+            shutil.copy2(path, REPLAY_FIXTURE_DIR)
+    if len(args.paths) > 1:
+        print(f"{len(args.paths) - failed - skipped} OK, {failed} erreurs, {skipped} ignorés")
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,112 @@
+import pygame
+from collections import OrderedDict
+
+# --- Rotation Cache ---
+# Rotating a meteor with rotozoom every frame is expensive, so every source
+# surface is rendered once per angle step and shared by all meteors.
+# The collision mask of each angle is stored next to its image.
+
+DEFAULT_ROTATION_STEP = 3 # degrees between two cached angles
+DEFAULT_ROTATION_MEMORY = 32 * 1024 * 1024 # 32 Mo max for all rotated images
+
+class RotationCache:
+    def __init__(self, step=DEFAULT_ROTATION_STEP, max_bytes=DEFAULT_ROTATION_MEMORY):
+        # The circle is split in a whole number of steps so 0° and 360° share an image
+        self.steps = max(1, round(360 / step))
+        self.step = 360 / self.steps
+        self.max_bytes = max_bytes
+
+        self.images = OrderedDict() # (surface id, step index) -> [rotated surface, mask]
+        self.sources = {} # surface id -> surface (keeps the id valid)
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Mask counters for the current frame and the last finished one
+        self.masks_built = 0
+        self.masks_reused = 0
+        self.last_frame_masks = {"built": 0, "reused": 0}
+        self.masks_prebuilt = 0 # built by prerender() while loading
+
+    def step_index(self, angle):
+        return round(angle / self.step) % self.steps
+
+    def prerender(self, surface, with_masks=True):
+        for index in range(self.steps):
+            key = (id(surface), index)
+            entry = self.images.get(key) or self._render(surface, key)
+            if with_masks and entry[1] is None:
+                self._build_mask(entry)
+                self.masks_prebuilt += 1
+
+    def get(self, surface, angle):
+        return self._entry(surface, angle)[0]
+
+    def get_mask(self, surface, angle):
+        entry = self._entry(surface, angle)
+        if entry[1] is None:
+            self._build_mask(entry)
+            self.masks_built += 1
+        else:
+            self.masks_reused += 1
+        return entry[1]
+
+    def new_frame(self):
+        # Called at the end of each frame so the mask counters read "per frame"
+        # (the profiler records last_frame_masks)
+        self.last_frame_masks = {"built": self.masks_built, "reused": self.masks_reused}
+        self.masks_built = 0
+        self.masks_reused = 0
+
+    def clear(self):
+        self.images.clear()
+        self.sources.clear()
+        self.bytes_used = 0
+
+    def trim(self, max_bytes):
+        # Memory budget (code/memory_tracker.py): lowers the cap for good, so
+        # the cache doesn't grow back past it and get trimmed again at every
+        # sample; the angles dropped are rendered again when a meteor needs them
+        self.max_bytes = min(self.max_bytes, max_bytes)
+        self._enforce_limit()
+
+    def _entry(self, surface, angle):
+        key = (id(surface), self.step_index(angle))
+        entry = self.images.get(key)
+        if entry is None:
+            self.misses += 1
+            return self._render(surface, key)
+        self.hits += 1
+        self.images.move_to_end(key)
+        return entry
+
+    def _render(self, surface, key):
+        self.sources[key[0]] = surface
+        image = pygame.transform.rotozoom(surface, key[1] * self.step, 1)
+        entry = [image, None]
+        self.images[key] = entry
+        self.bytes_used += surface_bytes(image)
+        self._enforce_limit()
+        return entry
+
+    def _build_mask(self, entry):
+        entry[1] = pygame.mask.from_surface(entry[0])
+        self.bytes_used += mask_bytes(entry[1])
+        self._enforce_limit()
+
+    def _enforce_limit(self):
+        # Over the memory cap: drop the least recently used angles first
+        while self.bytes_used > self.max_bytes and len(self.images) > 1:
+            old_key, (old_image, old_mask) = self.images.popitem(last=False)
+            self.bytes_used -= surface_bytes(old_image)
+            if old_mask is not None:
+                self.bytes_used -= mask_bytes(old_mask)
+            self.evictions += 1
+
+def surface_bytes(surface):
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+def mask_bytes(mask):
+    width, height = mask.get_size()
+    return width * height // 8
@@ -0,0 +1,150 @@
+import os
+import json
+import time
+import heapq
+
+# --- Score Store ---
+# Every finished run is appended as one JSON line to a log file (no re-read,
+# no sort, no rewrite). The best runs are kept in memory in small min-heaps:
+# overall, per skin and per day (only the last KEEP_DAYS days). When the log
+# has grown by COMPACT_AFTER lines since the last compaction it is compacted
+# down to the runs that are still in one of the leaderboards.
+
+SCORE_LOG_FILE = 'scores_log.jsonl'
+LEGACY_SCORE_FILE = 'scores.json' # old format: a plain list of the 10 best scores
+TOP_K = 10
+COMPACT_AFTER = 1000 # new log lines before a compaction
+KEEP_DAYS = 7 # days with a leaderboard, older ones are forgotten
+
+def day_of(timestamp):
+    return time.strftime('%Y-%m-%d', time.localtime(timestamp))
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def valid_run(run):
+    # A run read from the log with the missing fields filled in, None without a score
+    if not isinstance(run, dict) or not is_number(run.get("score")):
+        return None
+    skin = run.get("skin")
+    upgrades = run.get("upgrades")
+    duration = run.get("duration")
+    return {
+        "score": run["score"],
+        "timestamp": run["timestamp"] if is_number(run.get("timestamp")) else 0,
+        "skin": skin if isinstance(skin, str) else None,
+        "upgrades": upgrades if isinstance(upgrades, list) else [],
+        "duration": duration if is_number(duration) else None,
+    }
+
+class ScoreStore:
+    def __init__(self, path=SCORE_LOG_FILE, legacy_path=LEGACY_SCORE_FILE, top_k=TOP_K, compact_after=COMPACT_AFTER,
+                 keep_days=KEEP_DAYS):
+        self.path = path
+        self.top_k = top_k
+        self.compact_after = compact_after
+        self.keep_days = keep_days
+
+        self.best = [] # heap of (score, order, run)
+        self.best_by_skin = {}
+        self.best_by_day = {}
+        self.order = 0 # keeps older runs first when scores are equal
+        self.log_lines = 0
+        self.skipped_lines = 0 # valid JSON but not a run
+        self.next_compaction = compact_after # log lines that trigger the next one
+
+        if os.path.exists(path):
+            self._read_log()
+        elif legacy_path and os.path.exists(legacy_path):
+            self._import_legacy(legacy_path)
+
+    def add(self, score, skin=None, upgrades=None, duration=None, timestamp=None):
+        run = {
+            "score": score,
+            "timestamp": time.time() if timestamp is None else timestamp,
+            "skin": skin,
+            "upgrades": upgrades or [],
+            "duration": duration,
+        }
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(run) + '\n')
+        self.log_lines += 1
+        self._keep(run)
+
+        if self.log_lines > self.next_compaction:
+            self.compact()
+        return run
+
+    def top(self, skin=None, day=None):
+        # Best runs first. skin / day ('YYYY-MM-DD') pick a specific leaderboard.
+        if skin is not None:
+            heap = self.best_by_skin.get(skin, [])
+        elif day is not None:
+            heap = self.best_by_day.get(day, [])
+        else:
+            heap = self.best
+        return [run for score, order, run in sorted(heap, key=lambda item: (-item[0], item[1]))]
+
+    def top_scores(self, skin=None, day=None):
+        return [run["score"] for run in self.top(skin, day)]
+
+    def compact(self):
+        # Rewrites the log with only the runs still in a leaderboard
+        kept = {}
+        for heap in [self.best, *self.best_by_skin.values(), *self.best_by_day.values()]:
+            for score, order, run in heap:
+                kept[order] = run
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'w') as f:
+            for order in sorted(kept):
+                f.write(json.dumps(kept[order]) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        self.log_lines = len(kept)
+        # Relative to what is left, so a log full of kept runs isn't rewritten on every add
+        self.next_compaction = len(kept) + self.compact_after
+
+    def _keep(self, run):
+        item = (run["score"], self.order, run)
+        self.order += 1
+        self._push(self.best, item)
+        if run["skin"] is not None:
+            self._push(self.best_by_skin.setdefault(run["skin"], []), item)
+        if run["timestamp"]:
+            self._push(self.best_by_day.setdefault(day_of(run["timestamp"]), []), item)
+            if len(self.best_by_day) > self.keep_days:
+                del self.best_by_day[min(self.best_by_day)] # 'YYYY-MM-DD' sorts by date
+
+    def _push(self, heap, item):
+        # Min-heap of size top_k: the worst kept run is at heap[0]
+        if len(heap) < self.top_k:
+            heapq.heappush(heap, item)
+        elif item[0] > heap[0][0]:
+            heapq.heapreplace(heap, item)
+
+    def _read_log(self):
+        with open(self.path, 'r') as f:
+            for line in f:
+                try:
+                    run = json.loads(line)
+                except json.JSONDecodeError:
+                    continue # line cut by a crash
+                self.log_lines += 1
+                run = valid_run(run)
+                if run is None:
+                    self.skipped_lines += 1 # hand-edited or from another format, dropped at the next compaction
+                    continue
+                self._keep(run)
+
+    def _import_legacy(self, legacy_path):
+        try:
+            with open(legacy_path, 'r') as f:
+                scores = json.load(f)
+        except json.JSONDecodeError:
+            return
+        if not isinstance(scores, list):
+            return
+        for score in scores:
+            if is_number(score):
+                self.add(score, timestamp=0)
@@ -0,0 +1,101 @@
+import sys
+import pygame
+
+from settings import *
+from renderer import LayeredRenderer
+from texture_renderer import TextureRenderer
+from text_cache import render_text
+
+# --- Shared Screens ---
+# The window setup, the score box and the shop page, without the rest of
+# main.py (save data thread, loading behind the title, reports at exit), so
+# the benchmark can draw exactly what the game draws.
+
+WINDOW_TITLE = "Le Justicier de la Galaxie"
+
+def open_window(backend=RENDER_BACKEND, driver=RENDER_DRIVER, title=WINDOW_TITLE):
+    # (renderer, surface the menus and HUD are drawn on)
+    # "texture": SDL Renderer and textures, "surface" (or when that fails): software blits
+    if backend == "texture":
+        try:
+            renderer = TextureRenderer(title, driver)
+            return renderer, renderer.surface # sent as a texture
+        except pygame.error as error:
+            print(f"Rendu par textures impossible ({error}), rendu par surfaces.", file=sys.stderr)
+    display_surface = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption(title)
+    return LayeredRenderer(display_surface), display_surface
+
+def display_score(surface, score):
+    text_surf = render_text(str(score), 40, (240, 240, 240)) # rendered again only when the score changes
+    text_rect = text_surf.get_rect(midbottom=(WINDOW_WIDTH / 2, WINDOW_HEIGHT - 50))
+
+    box_rect = pygame.draw.rect(surface, (240, 240, 240), text_rect.inflate(20, 10).move(0,-6), 5, 10)
+    surface.blit(text_surf, text_rect)
+    return box_rect.union(text_rect) # area to refresh on screen
+
+def draw_shop(surface, player_data, starfield, dt=0):
+    # Draws one frame of the shop and returns the items in key order (1, 2, ...)
+    # Every label goes through the text cache, only changed ones are rendered again
+    all_available_items = []
+
+    starfield.draw(surface, dt)
+
+    title_text = render_text("Boutique", 60, (240, 240, 240))
+    title_rect = title_text.get_rect(center=(WINDOW_WIDTH // 2, 70))
+    surface.blit(title_text, title_rect)
+
+    coins_text = render_text(f"Vos Pièces: {player_data['coins']}", 25, (255, 215, 0))
+    surface.blit(coins_text, coins_text.get_rect(midtop=(WINDOW_WIDTH // 2, title_rect.bottom + 20)))
+
+    current_y = coins_text.get_rect().bottom + 40
+    item_counter = 1
+
+    # --- Upgrades ---
+    upgrade_title = render_text("--- Améliorations ---", 30, (150, 150, 255))
+    surface.blit(upgrade_title, upgrade_title.get_rect(midleft=(50, current_y)))
+    current_y += 50
+
+    for item in SHOP_ITEMS["upgrades"]:
+        owned = player_data["upgrades"].get(item["key"], False)
+        color = (100, 255, 100) if owned else (200, 200, 200)
+        status_text = "(Acheté)" if owned else f"- {item['cost']} pièces"
+
+        all_available_items.append(item)
+
+        item_text = render_text(f"{item_counter}. {item['name']} {status_text}", 30, color)
+        surface.blit(item_text, item_text.get_rect(midleft=(50, current_y)))
+
+        desc_text = render_text(f"    {item['desc']}", 25, (180, 180, 180))
+        surface.blit(desc_text, desc_text.get_rect(midleft=(50, current_y + 35)))
+
+        item_counter += 1
+        current_y += 75
+
+    # --- Skins ---
+    skin_title = render_text("--- Apparences ---", 30, (255, 150, 150))
+    surface.blit(skin_title, skin_title.get_rect(midleft=(50, current_y)))
+    current_y += 50
+
+    for item in SHOP_ITEMS["skins"]:
+        owned = player_data["skins"].get(item["key"], False)
+        selected = player_data["selected_skin"] == item["key"]
+        color = (100, 255, 255) if selected else (100, 255, 100) if owned else (200, 200, 200)
+        status_text = "(Sélectionné)" if selected else "(Acheté - Appuyer pour équiper)" if owned else f"- {item['cost']} pièces"
+
+        all_available_items.append(item)
+
+        item_text = render_text(f"{item_counter}. {item['name']} {status_text}", 30, color)
+        surface.blit(item_text, item_text.get_rect(midleft=(50, current_y)))
+
+        desc_text = render_text(f"    {item['desc']}", 25, (180, 180, 180))
+        surface.blit(desc_text, desc_text.get_rect(midleft=(50, current_y + 35)))
+
+        item_counter += 1
+        current_y += 75
+
+    # Instructions
+    instruction_text = render_text("Appuyez sur un numéro pour acheter/équiper. Échap pour retourner au menu.", 25, (200, 200, 200))
+    surface.blit(instruction_text, instruction_text.get_rect(midbottom=(WINDOW_WIDTH // 2, WINDOW_HEIGHT - 30)))
+
+    return all_available_items
@@ -0,0 +1,120 @@
+# --- Game Settings ---
+# Shared by the game window, the headless simulation and the tools.
+
+WINDOW_WIDTH, WINDOW_HEIGHT = 1280, 720
+
+# Durée du power-up en millisecondes
+RAPID_FIRE_DURATION = 5000
+RAPID_FIRE_COOLDOWN = 100 # ms between two lasers during rapid fire
+
+METEOR_SPAWN_INTERVAL = 500 # ms between two meteors
+YELLOW_METEOR_ODDS = 30 # 1 chance sur 30 d'avoir un météore jaune
+YELLOW_METEOR_COINS = 20
+METEOR_COINS = 1
+STAR_COUNT = 20
+
+# Meteors and lasers as Sprites ("sprites") or NumPy arrays ("numpy", needs numpy).
+# NumPy is about 3x slower with the usual dozen meteors and only pays off with
+# thousands of them.
+ENTITY_BACKEND = "sprites"
+
+# Drawing: "surface" (software blits onto the window) or "texture" (SDL
+# Renderer, images uploaded once as textures; falls back to "surface").
+# RENDER_DRIVER picks the SDL renderer, e.g. "software" without a GPU (None: SDL chooses)
+RENDER_BACKEND = "surface"
+RENDER_DRIVER = None
+
+# The game is simulated at a fixed rate, whatever the frame rate of the window
+SIMULATION_RATE = 60 # steps per second
+RENDER_FPS = 60 # frame rate cap of the window
+
+# Difficulty over the game time, interpolated between the keyframes:
+# (seconds, ms between meteors, 1 in N meteors is yellow, most meteors alive at once)
+DIFFICULTY_CURVE = [
+    (0, METEOR_SPAWN_INTERVAL, YELLOW_METEOR_ODDS, 30),
+    (60, 400, YELLOW_METEOR_ODDS, 40),
+    (180, 300, 25, 50),
+]
+# When frames take longer than this, fewer explosions are shown at once
+FRAME_BUDGET_MS = 1000 / RENDER_FPS
+MAX_EXPLOSIONS = 40
+
+# Explosions and engine trails in the game window: "particles" (needs numpy)
+# or "sprites" (AnimatedExplosion frames, limited by MAX_EXPLOSIONS)
+EXPLOSION_EFFECT = "particles"
+MAX_PARTICLES = 30000 # hard cap, new particles are dropped past it
+
+# Sound effects (code/sound_manager.py): mixer channels of each category,
+# priority for voice stealing (higher wins) and plays of one sound kept per
+# frame (the others are merged into them)
+SOUND_CATEGORIES = {
+    "damage": {"channels": 1, "priority": 3, "per_frame": 1},
+    "explosion": {"channels": 3, "priority": 2, "per_frame": 2},
+    "laser": {"channels": 2, "priority": 1, "per_frame": 1},
+}
+SHARED_SOUND_CHANNELS = 2 # used by any category once its own are busy
+
+# Profiler (F3 in game): metrics file (.csv or .json), cProfile frame range
+METRICS_FILE = 'metrics.csv'
+PROFILE_FRAMES = None # (first, last) frames of a game, e.g. (300, 600)
+PROFILE_FILE = 'game.prof'
+
+# Memory (code/memory_tracker.py): bytes of each asset, cache and sprite group,
+# measured every MEMORY_SAMPLE_INTERVAL ms in game. A cache over its budget is
+# trimmed (least recently used first); past MEMORY_BUDGET for everything
+# tracked, caches are trimmed in this order until it fits. None: no limit
+MEMORY_BUDGETS = {
+    "textures": 64 * 1024 * 1024, # texture renderer only
+    "text_cache": 4 * 1024 * 1024,
+    "rotation_cache": 32 * 1024 * 1024,
+}
+MEMORY_BUDGET = None # e.g. 48 * 1024 * 1024 on a low-RAM cabinet
+MEMORY_SAMPLE_INTERVAL = 1000
+MEMORY_TRACEMALLOC = False # trace allocations from the start (slower), else from the first F4
+MEMORY_SNAPSHOT_FILE = 'memory.snapshot'
+
+# Every game's input is recorded so it can be replayed headless (code/replay.py)
+RECORD_REPLAYS = True
+REPLAY_DIR = 'replays'
+REPLAY_KEEP = 20 # most recent recordings kept
+REPLAY_FIXTURE_DIR = 'fixtures/replays' # long sessions kept in git as regression fixtures, never pruned
+
+# LAN co-op (code/netplay.py): the server simulates at its own tick rate
+NET_PORT = 50007
+NET_TICK_RATE = 30 # simulation steps and snapshots per second
+NET_TIMEOUT = 5 # seconds without a packet before a player is dropped
+
+# Killed lasers, meteors, explosions and power-ups kept for reuse (per type)
+SPRITE_POOL_SIZE = 512
+
+# Menu background: "static" (one blit per frame) or "parallax" (scrolling star layers)
+MENU_STARFIELD_MODE = "static"
+# Menus only redraw on input or at this rate when animated (parallax stars)
+MENU_ANIMATION_FPS = 30
+MENU_IDLE_TIMEOUT = 1000 # ms, longest wait for input when nothing moves
+
+# Default data if the save file doesn't exist or is corrupted
+DEFAULT_PLAYER_DATA = {
+    "coins": 0,
+    "upgrades": {
+        "slower_cooldown": False,
+        "faster_movement_speed": False
+    },
+    "skins": {
+        "default": True,
+        "yellow_ship": False
+    },
+    "selected_skin": "default"
+}
+
+# Shop catalogue (also read by the balancing tool, code/batch.py)
+SHOP_ITEMS = {
+    "upgrades": [
+        {"name": "Refroidissement Amélioré", "desc": "Tir plus rapide (Cooldown -50%)", "cost": 100, "key": "slower_cooldown", "type": "upgrade"},
+        {"name": "Propulseurs Améliorés", "desc": "Vitesse de déplacement +50%", "cost": 150, "key": "faster_movement_speed", "type": "upgrade"},
+    ],
+    "skins": [
+        {"name": "Vaisseau Standard", "desc": "Le look classique.", "cost": 0, "key": "default", "type": "skin"},
+        {"name": "Vaisseau Jaune", "desc": "Change l'apparence de votre vaisseau", "cost": 200, "key": "yellow_ship", "type": "skin"},
+    ]
+}
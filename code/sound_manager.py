@@ -0,0 +1,85 @@
+import pygame
+
+from settings import SOUND_CATEGORIES, SHARED_SOUND_CHANNELS
+
+# --- Sound Manager ---
+# A frame with many kills used to call explosion_soud.play() once per meteor
+# and could grab every mixer channel. Sound effects now go through here:
+# play() only counts what was asked, end_frame() plays it.
+# - Identical sounds of one frame are merged (at most "per_frame" plays each).
+# - Each category has its own channels, plus a few shared ones. When they are
+#   all busy, the lowest priority voice (the oldest among equals) is cut,
+#   never one of a higher priority category; otherwise the play is dropped.
+# - The number of channels is fixed, so the mixing load is bounded. They are
+#   all reserved: a stray Sound.play() can't take them, and the music is
+#   streamed by pygame.mixer.music, outside of these channels.
+
+class SoundManager:
+    def __init__(self, categories=SOUND_CATEGORIES, shared_channels=SHARED_SOUND_CHANNELS):
+        self.categories = categories
+        self.sounds = {} # name -> (Sound, category)
+        self.requests = {} # name -> plays asked this frame
+        self.frame = 0
+        self.stats = {category: {"played": 0, "merged": 0, "stolen": 0, "dropped": 0} for category in categories}
+
+        # Without a mixer (no sound card) play() does nothing
+        self.enabled = pygame.mixer.get_init() is not None
+        if not self.enabled:
+            return
+        total = sum(spec["channels"] for spec in categories.values()) + shared_channels
+        pygame.mixer.set_num_channels(total)
+        pygame.mixer.set_reserved(total)
+        self.channels = [pygame.mixer.Channel(index) for index in range(total)]
+        self.voices = [(0, 0)] * total # (priority, frame) of the last sound of each channel
+        self.reserved = {}
+        first = 0
+        for category, spec in categories.items():
+            self.reserved[category] = list(range(first, first + spec["channels"]))
+            first += spec["channels"]
+        self.shared = list(range(first, total))
+
+    def add(self, name, sound, category=None):
+        self.sounds[name] = (sound, category or name)
+
+    def play(self, name):
+        self.requests[name] = self.requests.get(name, 0) + 1
+
+    def end_frame(self):
+        # Highest priority first, so they get the free channels
+        self.frame += 1
+        requests = sorted(self.requests.items(), key=lambda item: -self.categories[self.sounds[item[0]][1]]["priority"])
+        self.requests = {}
+        if not self.enabled:
+            return
+        for name, count in requests:
+            sound, category = self.sounds[name]
+            spec = self.categories[category]
+            stats = self.stats[category]
+            plays = min(count, spec["per_frame"])
+            stats["merged"] += count - plays
+            for _ in range(plays):
+                index = self.find_channel(category, spec["priority"])
+                if index is None:
+                    stats["dropped"] += 1
+                    continue
+                self.channels[index].play(sound)
+                self.voices[index] = (spec["priority"], self.frame)
+                stats["played"] += 1
+
+    def find_channel(self, category, priority):
+        candidates = self.reserved[category] + self.shared
+        for index in candidates:
+            if not self.channels[index].get_busy():
+                return index
+        # Voice stealing: the lowest priority voice, the oldest one among equals
+        voices = [index for index in candidates if self.voices[index][0] <= priority]
+        if not voices:
+            return None
+        self.stats[category]["stolen"] += 1
+        return min(voices, key=lambda index: self.voices[index])
+
+    def report(self):
+        for category, stats in self.stats.items():
+            if stats["played"] or stats["dropped"]:
+                print(f"Sons {category} : {stats['played']} joués, {stats['merged']} fusionnés, "
+                      f"{stats['stolen']} voix volées, {stats['dropped']} perdus")
@@ -0,0 +1,56 @@
+import pygame
+
+# --- Spatial Hash ---
+# Uniform grid used as a broadphase: sprites are bucketed by the cells their
+# rect covers, so a collision test only looks at sprites in nearby cells
+# instead of the whole group. The exact test (masks) stays the same.
+
+DEFAULT_CELL_SIZE = 128 # about the size of a rotated meteor
+
+class SpatialHash:
+    def __init__(self, cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {} # (cell x, cell y) -> list of sprites
+        self.order = {} # sprite -> position in the group, to keep the group order
+        self.candidates_tested = 0
+
+    def rebuild(self, sprites):
+        # Called once per frame, after the sprites moved
+        self.cells.clear()
+        self.order.clear()
+        for index, sprite in enumerate(sprites):
+            self.order[sprite] = index
+            for cell in self._cells(sprite.rect):
+                bucket = self.cells.get(cell)
+                if bucket is None:
+                    self.cells[cell] = [sprite]
+                else:
+                    bucket.append(sprite)
+
+    def query(self, rect):
+        found = set()
+        for cell in self._cells(rect):
+            bucket = self.cells.get(cell)
+            if bucket:
+                found.update(bucket)
+        # Same order as iterating the group, so hits come back like spritecollide
+        return sorted(found, key=self.order.__getitem__)
+
+    def spritecollide(self, sprite, dokill, collided=pygame.sprite.collide_mask):
+        # Drop-in for pygame.sprite.spritecollide on the hashed group.
+        # Sprites killed earlier this frame are skipped since they are no longer alive.
+        candidates = self.query(sprite.rect)
+        self.candidates_tested += len(candidates)
+        hits = [other for other in candidates if other.alive() and collided(sprite, other)]
+        if dokill:
+            for other in hits:
+                other.kill()
+        return hits
+
+    def _cells(self, rect):
+        size = self.cell_size
+        left, top = rect.left // size, rect.top // size
+        right, bottom = (rect.right - 1) // size, (rect.bottom - 1) // size
+        for x in range(left, right + 1):
+            for y in range(top, bottom + 1):
+                yield (x, y)
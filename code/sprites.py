@@ -0,0 +1,197 @@
+import pygame
+from collections import namedtuple
+import random
+
+from settings import WINDOW_WIDTH, WINDOW_HEIGHT
+from rotation_cache import RotationCache
+from assets import assets
+from pool import PooledSprite
+
+# Pre-rotated meteor images shared by every meteor
+meteor_rotations = RotationCache()
+
+# Input of one frame. fire is the space bar held down (rapid fire),
+# fire_pressed is a new press of space during the frame.
+PlayerInput = namedtuple('PlayerInput', 'left right up down boost fire fire_pressed', defaults=(False,) * 7)
+
+def read_player_input(fire_pressed=False):
+    keys = pygame.key.get_pressed()
+    return PlayerInput(
+        left=keys[pygame.K_LEFT],
+        right=keys[pygame.K_RIGHT],
+        up=keys[pygame.K_UP],
+        down=keys[pygame.K_DOWN],
+        boost=keys[pygame.K_LSHIFT] or keys[pygame.K_RSHIFT],
+        fire=keys[pygame.K_SPACE],
+        fire_pressed=fire_pressed,
+    )
+
+# --- Game Classes ---
+
+class Player(pygame.sprite.Sprite):
+    def __init__(self, groups, player_data, get_ticks=pygame.time.get_ticks, skin=None, x=WINDOW_WIDTH / 2):
+        super().__init__(groups)
+        self.player_data = player_data
+        self.get_ticks = get_ticks # clock used for the laser cooldown
+        self.skin = skin # None: the skin selected in the shop
+        self.load_skin()
+
+        self.rect = self.image.get_rect(center=(x, (WINDOW_HEIGHT / 4) * 3))
+        self.previous_center = self.rect.center # position before the last step, for interpolation
+        self.direction = pygame.math.Vector2(0, 0)
+        self.controls = PlayerInput()
+
+        # Define base attributes BEFORE calling apply_upgrades
+        self.base_speed = 300
+        self.speed = self.base_speed
+
+        self.can_shoot = True
+        self.laser_shoot_time = 0
+        self.base_cooldown_duration = 400
+        self.cooldown_duration = self.base_cooldown_duration
+
+        self.apply_upgrades() # Now this call is safe
+
+        self.mask = assets.mask_of(self.image)
+
+    def load_skin(self):
+        # Skins are loaded once by the asset manager and shared between games
+        self.image = assets.skin(self.skin or self.player_data["selected_skin"])
+
+    def apply_upgrades(self):
+        # Apply movement speed upgrade
+        if self.player_data["upgrades"]["faster_movement_speed"]:
+            self.speed = self.base_speed * 1.5 # 50% faster
+        else:
+            self.speed = self.base_speed
+
+        # Apply cooldown upgrade
+        if self.player_data["upgrades"]["slower_cooldown"]:
+            self.cooldown_duration = self.base_cooldown_duration * 0.5 # 50% faster shooting
+        else:
+            self.cooldown_duration = self.base_cooldown_duration
+
+    def laser_timer(self):
+        if not self.can_shoot:
+            current_time = self.get_ticks()
+            if current_time - self.laser_shoot_time >= self.cooldown_duration:
+                self.can_shoot = True
+
+    def update(self, dt):
+        self.previous_center = self.rect.center
+        controls = self.controls
+        # Apply shift for temporary speed boost on top of upgrades
+        current_speed = self.speed * 2 if controls.boost else self.speed
+
+        self.direction.x = int(controls.right) - int(controls.left)
+        self.direction.y = int(controls.down) - int(controls.up)
+        self.direction = self.direction.normalize() if self.direction.length() > 0 else self.direction
+        self.rect.centerx += self.direction.x * current_speed * dt
+        self.rect.centery += self.direction.y * current_speed * dt
+
+        if self.rect.left < 0:
+            self.rect.left = 0
+        if self.rect.right > WINDOW_WIDTH:
+            self.rect.right = WINDOW_WIDTH
+        if self.rect.top < 0:
+            self.rect.top = 0
+        if self.rect.bottom > WINDOW_HEIGHT:
+            self.rect.bottom = WINDOW_HEIGHT
+
+        self.laser_timer()
+
+class Star(pygame.sprite.Sprite):
+    def __init__(self, groups, surface, rng=random):
+        super().__init__(groups)
+        self.image = surface
+        self.rect = self.image.get_rect(center=(rng.randint(0, WINDOW_WIDTH), rng.randint(0, WINDOW_HEIGHT)))
+
+class Laser(PooledSprite):
+    def __init__(self, surf, pos, groups):
+        super().__init__(groups)
+        self.reset(surf, pos)
+
+    def reset(self, surf, pos):
+        self.image = surf
+        self.rect = self.image.get_rect(midbottom=pos)
+        self.previous_center = self.rect.center
+        self.mask = assets.mask_of(surf)
+
+    def update(self, dt):
+        self.previous_center = self.rect.center
+        self.rect.centery -= 400 * dt
+        if self.rect.bottom < 0:
+            self.kill()
+
+class Meteor(PooledSprite):
+    def __init__(self, original_surf, pos, groups, is_powerup_carrier=False, rng=random): # Ajout de is_powerup_carrier
+        super().__init__(groups)
+        self.reset(original_surf, pos, is_powerup_carrier, rng)
+
+    def reset(self, original_surf, pos, is_powerup_carrier=False, rng=random):
+        self.original_surf = original_surf
+        self.image = original_surf
+        self.rect = self.image.get_rect(center=pos)
+        self.previous_center = self.rect.center
+        self.age = 0 # ms since the meteor appeared
+        self.life_time = 3000
+        self.direction = pygame.math.Vector2(rng.uniform(-0.5, 0.5), 1)
+        self.speed = rng.randint(400, 500)
+        self.rotation = 0
+        self.rotation_speed = rng.randint(50, 150)
+        self.is_powerup_carrier = is_powerup_carrier # Stocke l'information
+
+    def update(self, dt):
+        self.previous_center = self.rect.center
+        self.rect.centerx += self.direction.x * self.speed * dt
+        self.rect.centery += self.direction.y * self.speed * dt
+        if self.rect.top > WINDOW_HEIGHT or self.rect.left > WINDOW_WIDTH or self.rect.right < 0:
+            self.kill()
+        self.age += dt * 1000
+        if self.age >= self.life_time:
+            self.kill()
+
+        self.rotation += self.rotation_speed * dt
+        self.image = meteor_rotations.get(self.original_surf, self.rotation)
+        self.rect = self.image.get_rect(center=self.rect.center)
+
+    @property
+    def mask(self):
+        # Used by collide_mask: the mask of this angle is built once and then shared
+        return meteor_rotations.get_mask(self.original_surf, self.rotation)
+
+class AnimatedExplosion(PooledSprite):
+    def __init__(self, frames, pos, groups):
+        super().__init__(groups)
+        self.reset(frames, pos)
+
+    def reset(self, frames, pos):
+        self.frames = frames
+        self.frame_index = 0
+        self.image = self.frames[self.frame_index]
+        self.rect = self.image.get_rect(center=pos)
+        self.previous_center = self.rect.center # explosions don't move
+
+    def update(self, dt):
+        self.frame_index += 20 * dt
+        if self.frame_index < len(self.frames):
+            self.image = self.frames[int(self.frame_index) % len(self.frames)]
+        else:
+            self.kill()
+
+class PowerUp(PooledSprite):
+    def __init__(self, pos, groups):
+        super().__init__(groups)
+        self.reset(pos)
+
+    def reset(self, pos):
+        self.image = assets.image('powerup')
+        self.rect = self.image.get_rect(center=pos)
+        self.previous_center = self.rect.center
+        self.mask = assets.mask('powerup')
+
+    def update(self, dt):
+        self.previous_center = self.rect.center
+        self.rect.centery += 150 * dt
+        if self.rect.top > WINDOW_HEIGHT:
+            self.kill()
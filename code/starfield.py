@@ -0,0 +1,68 @@
+import pygame
+import random
+
+from settings import WINDOW_WIDTH, WINDOW_HEIGHT
+
+# --- Starfield ---
+# Background of the menu screens. The stars are rendered once into surfaces:
+# "static" draws them with a single blit, "parallax" scrolls a few layers
+# at different speeds by moving the blit offset (two blits per layer).
+
+MENU_BACKGROUND_COLOR = '#1f1b24'
+STAR_COLOR = (255, 255, 255)
+
+# (number of stars, radius, scroll speed in px/s) for each layer, far to near
+STAR_LAYERS = [
+    (60, 1, 8),
+    (30, 1, 20),
+    (10, 2, 45),
+]
+
+def opaque_surface(size):
+    # convert() needs a display mode (there is none with the texture renderer)
+    surface = pygame.Surface(size)
+    return surface.convert() if pygame.display.get_surface() else surface
+
+class Starfield:
+    def __init__(self, mode="static", layers=STAR_LAYERS, background_color=MENU_BACKGROUND_COLOR, seed=None):
+        self.mode = mode
+        self.size = (WINDOW_WIDTH, WINDOW_HEIGHT)
+        rng = random.Random(seed)
+
+        # Static: background and every star in one opaque surface
+        self.background = opaque_surface(self.size)
+        self.background.fill(background_color)
+
+        # Parallax: the farthest layer carries the background color, the
+        # others use a colorkey (faster to blit than per-pixel alpha)
+        self.layers = [] # [surface, speed, offset]
+        for index, (count, radius, speed) in enumerate(layers):
+            layer = opaque_surface(self.size)
+            if index == 0:
+                layer.fill(background_color)
+            else:
+                layer.fill((0, 0, 0))
+                layer.set_colorkey((0, 0, 0))
+            for i in range(count):
+                pos = (rng.randint(0, WINDOW_WIDTH), rng.randint(0, WINDOW_HEIGHT))
+                pygame.draw.circle(layer, STAR_COLOR, pos, radius)
+                pygame.draw.circle(self.background, STAR_COLOR, pos, radius)
+            self.layers.append([layer, speed, 0.0])
+
+    @property
+    def animated(self):
+        return self.mode == "parallax"
+
+    def draw(self, surface, dt=0):
+        if self.mode != "parallax":
+            surface.blit(self.background, (0, 0))
+            return
+
+        height = self.size[1]
+        for layer in self.layers:
+            image, speed, offset = layer
+            offset = (offset + speed * dt) % height
+            layer[2] = offset
+            # The layer moves down and wraps around: its bottom part is drawn on top
+            surface.blit(image, (0, offset - height))
+            surface.blit(image, (0, offset))
@@ -0,0 +1,85 @@
+import pygame
+from os.path import join
+from collections import OrderedDict
+
+from rotation_cache import surface_bytes
+
+# --- Text Cache ---
+# Fonts are opened once per (file, size) and rendered texts are kept in an
+# LRU cache keyed by (font, size, text, color), so a label that didn't
+# change is never rasterized twice.
+
+FONT_PATH = join('images', 'Oxanium-Bold.ttf')
+DEFAULT_TEXT_CACHE_SIZE = 256
+
+class FontRegistry:
+    def __init__(self):
+        self.fonts = {} # (path, size) -> pygame.font.Font
+
+    def get(self, size, path=FONT_PATH):
+        key = (path, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(path, size)
+            self.fonts[key] = font
+        return font
+
+class TextCache:
+    def __init__(self, fonts, max_entries=DEFAULT_TEXT_CACHE_SIZE):
+        self.fonts = fonts
+        self.max_entries = max_entries
+        self.max_bytes = None # set by trim()
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, size, color, path=FONT_PATH):
+        key = (path, size, text, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.fonts.get(size, path).render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        if self.max_bytes is not None:
+            self._enforce_bytes()
+        return surface
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self.surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0,
+        }
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def bytes_used(self):
+        return sum(surface_bytes(surface) for surface in self.surfaces.values())
+
+    def trim(self, max_bytes):
+        # Memory budget: the least recently used texts go first, and the cache
+        # stays under max_bytes from then on instead of growing back
+        self.max_bytes = max_bytes if self.max_bytes is None else min(self.max_bytes, max_bytes)
+        self._enforce_bytes()
+
+    def _enforce_bytes(self):
+        used = self.bytes_used()
+        while used > self.max_bytes and self.surfaces:
+            key, surface = self.surfaces.popitem(last=False)
+            used -= surface_bytes(surface)
+
+# Shared by every screen and the HUD
+fonts = FontRegistry()
+text_cache = TextCache(fonts)
+
+def render_text(text, size, color):
+    return text_cache.render(text, size, color)
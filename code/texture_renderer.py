@@ -0,0 +1,160 @@
+import os
+import pygame
+try:
+    from pygame._sdl2.video import Window, Renderer, Texture, get_drivers
+except ImportError: # old pygame: the surface renderer is used
+    Window = None
+
+from settings import WINDOW_WIDTH, WINDOW_HEIGHT
+from renderer import GAME_BACKGROUND_COLOR
+from rotation_cache import surface_bytes
+
+# --- Texture Renderer ---
+# Same job as the LayeredRenderer, on an SDL Renderer (pygame._sdl2.video)
+# instead of software blits onto the display surface. Every image is uploaded
+# once as a texture, meteors are drawn from their unrotated image and turned
+# by the renderer (no rotozoom), and consecutive copies of one texture are
+# batched by SDL (SDL_RENDER_BATCHING). Works with SDL's "software" renderer
+# on machines without a GPU.
+#
+# A window with a Renderer has no display surface, so menus and the HUD
+# (score, profiler) are drawn onto `surface` as usual: menus send the whole
+# surface as one texture, the game only the areas given to add_rect().
+
+BLEND_NONE, BLEND_ALPHA, BLEND_ADD = 0, 1, 2 # SDL_BlendMode
+
+class TextureRenderer:
+    def __init__(self, title, driver=None, background_color=GAME_BACKGROUND_COLOR):
+        if Window is None:
+            raise pygame.error("pygame._sdl2.video n'est pas disponible")
+        os.environ.setdefault('SDL_RENDER_BATCHING', '1')
+        index = -1 # SDL picks the best renderer
+        if driver is not None:
+            names = [info.name for info in get_drivers()]
+            if driver not in names:
+                raise pygame.error(f"pas de renderer SDL '{driver}' ({', '.join(names)})")
+            index = names.index(driver)
+        self.window = Window(title, (WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.renderer = Renderer(self.window, index=index, vsync=False)
+        self.name = f"texture ({driver or 'auto'})"
+        self.background_color = background_color
+        self.screen_rect = pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
+
+        # What main.py uses as display_surface
+        self.surface = pygame.Surface(self.screen_rect.size, pygame.SRCALPHA)
+        self.surface_texture = Texture(self.renderer, self.screen_rect.size, streaming=True)
+        self.additive_texture = Texture(self.renderer, self.screen_rect.size, streaming=True)
+        self.additive_texture.blend_mode = BLEND_ADD
+
+        self.textures = {} # surface id -> (surface, Texture), the surface keeps the id valid
+        self.background = None
+        self.hud_rects = [] # drawn on the surface this frame
+        self.clear_surface = True
+        self.uploads = 0
+        self.max_texture_bytes = None # set by trim()
+
+    def texture(self, surface):
+        entry = self.textures.get(id(surface))
+        if entry is None:
+            if self.max_texture_bytes is not None:
+                self._enforce_bytes(self.max_texture_bytes - surface_bytes(surface))
+            entry = self.textures[id(surface)] = (surface, Texture.from_surface(self.renderer, surface))
+            self.uploads += 1
+        return entry[1]
+
+    def texture_bytes(self):
+        # Approximate video memory of the cached textures
+        return sum(surface_bytes(surface) for surface, texture in self.textures.values())
+
+    def trim(self, max_bytes):
+        # Memory budget: the oldest uploads go first, they are sent again when
+        # drawn, and later uploads keep the cache under max_bytes
+        self.max_texture_bytes = max_bytes if self.max_texture_bytes is None else min(self.max_texture_bytes, max_bytes)
+        self._enforce_bytes(self.max_texture_bytes)
+
+    def _enforce_bytes(self, max_bytes):
+        used = self.texture_bytes()
+        for key in list(self.textures):
+            if used <= max_bytes:
+                break
+            surface, texture = self.textures.pop(key)
+            used -= surface_bytes(surface)
+
+    def bake_background(self, static_sprites):
+        background = pygame.Surface(self.screen_rect.size)
+        background.fill(self.background_color)
+        static_sprites.draw(background)
+        self.background = Texture.from_surface(self.renderer, background)
+        self.invalidate()
+
+    def invalidate(self):
+        # The surface still holds the last menu: emptied before the HUD is drawn on it
+        self.clear_surface = True
+
+    def begin_frame(self):
+        if self.clear_surface:
+            self.surface.fill((0, 0, 0, 0))
+            self.clear_surface = False
+        else:
+            for rect in self.hud_rects:
+                self.surface.fill((0, 0, 0, 0), rect)
+        self.hud_rects = []
+        self.renderer.draw_color = pygame.Color(self.background_color)
+        self.renderer.clear()
+        if self.background is not None:
+            self.background.draw()
+
+    def draw_game(self, sim, alpha=1.0):
+        self.draw_textures(sim.texture_list(alpha))
+        if sim.particles is not None:
+            self.draw_additive(sim.particles.images())
+
+    def draw_textures(self, items):
+        # (surface, center, angle) triples, angles in degrees clockwise
+        for surface, (x, y), angle in items:
+            texture = self.texture(surface)
+            width, height = surface.get_size()
+            rect = (round(x - width / 2), round(y - height / 2), width, height)
+            if angle:
+                texture.draw(dstrect=rect, angle=angle)
+            else:
+                texture.draw(dstrect=rect)
+
+    def draw_blits(self, blits):
+        # (image, position) pairs like LayeredRenderer.draw_blits, nothing turned
+        for image, position in blits:
+            self.texture(image).draw(dstrect=image.get_rect(topleft=pygame.Rect(position).topleft))
+
+    def draw_sprites(self, sprites):
+        self.draw_blits([(sprite.image, sprite.rect) for sprite in sprites])
+
+    def draw_additive(self, images):
+        for surface, position in images:
+            area = surface.get_rect(topleft=position).clip(self.screen_rect)
+            if area.width and area.height:
+                self.additive_texture.update(surface.subsurface(area.move(-position[0], -position[1])), area)
+                self.additive_texture.draw(srcrect=area, dstrect=area)
+
+    def add_rect(self, rect):
+        # Something was drawn on the surface there (score box...)
+        rect = rect.clip(self.screen_rect)
+        if rect.width and rect.height:
+            self.hud_rects.append(rect)
+
+    def end_frame(self):
+        self.surface_texture.blend_mode = BLEND_ALPHA
+        for rect in self.hud_rects:
+            self.surface_texture.update(self.surface.subsurface(rect), rect)
+            self.surface_texture.draw(srcrect=rect, dstrect=rect)
+        self.renderer.present()
+
+    def present(self):
+        # Menus: the whole surface
+        self.surface_texture.blend_mode = BLEND_NONE
+        self.surface_texture.update(self.surface)
+        self.surface_texture.draw()
+        self.renderer.present()
+        self.invalidate()
+
+    def set_icon(self, surface):
+        self.window.set_icon(surface)